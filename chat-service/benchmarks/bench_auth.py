@@ -0,0 +1,77 @@
+# chat-service/benchmarks/bench_auth.py
+"""
+Auth cost per request for opaque vs signed tokens.
+
+    python benchmarks/bench_auth.py --opaque-token <drf token> -n 2000
+
+The opaque rows need a reachable users-management-service (USERS_SERVICE_URL)
+and a live DRF token; without --opaque-token only the signed row runs.
+AUTH_TOKEN_SIGNING_KEY must be set for the signed row.
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "chat_manager.settings")
+django.setup()
+
+from chat.auth_cache import get_local_cache  # noqa: E402
+from chat.signed_tokens import refresh_denylist, sign_claims  # noqa: E402
+from chat.utils import introspect_token, resolve_user_info  # noqa: E402
+
+
+def timed(label, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} {iterations:>7} req  {elapsed * 1e6 / iterations:>10.1f} us/req"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=2000)
+    parser.add_argument("--opaque-token", default=None)
+    args = parser.parse_args()
+
+    if args.opaque_token:
+        token = args.opaque_token
+        timed(
+            "opaque, uncached (HTTP)",
+            lambda: introspect_token(token),
+            max(1, args.iterations // 10),
+        )
+        get_local_cache().clear()
+        resolve_user_info(token)
+        timed(
+            "opaque, cached (local tier)",
+            lambda: resolve_user_info(token),
+            args.iterations,
+        )
+
+    signed = sign_claims(
+        {
+            "uid": 1,
+            "usr": "bench",
+            "eml": "bench@example.com",
+            "jti": uuid.uuid4().hex,
+            "exp": int(time.time()) + 3600,
+        }
+    )
+    refresh_denylist(force=True)
+    timed("signed, in-process", lambda: resolve_user_info(signed), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
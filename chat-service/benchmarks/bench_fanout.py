@@ -0,0 +1,91 @@
+# chat-service/benchmarks/bench_fanout.py
+"""
+CPU cost of fanning one chat message out to a room's sockets.
+
+    python benchmarks/bench_fanout.py --members 1000 -n 200
+
+"per-consumer" is the old path: every consumer rebuilds the frame dict and
+calls json.dumps. "encode-once" builds the broadcast_frame event once and each
+consumer only forwards its text. The encoder row shows whether orjson is used.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chat.frames import broadcast_event, chat_message_frame, orjson  # noqa: E402
+
+
+def per_consumer(event, members, sink):
+    for _ in range(members):
+        sink(
+            json.dumps(
+                {
+                    "type": "chat_message",
+                    "message": event["message"],
+                    "user_id": event.get("user_id"),
+                    "username": event.get("username"),
+                    "room_id": event.get("room_id"),
+                    "message_id": event.get("message_id"),
+                    "timestamp": event.get("timestamp"),
+                }
+            )
+        )
+
+
+def encode_once(event, members, sink):
+    frame = broadcast_event(
+        chat_message_frame(
+            event["message"],
+            event["user_id"],
+            event["username"],
+            event["room_id"],
+            event["message_id"],
+        )
+    )
+    for _ in range(members):
+        sink(frame["text"])
+
+
+def timed(label, fn, event, members, iterations):
+    sent = []
+    start = time.process_time()
+    for _ in range(iterations):
+        sent.clear()
+        fn(event, members, sent.append)
+    elapsed = time.process_time() - start
+    print(
+        f"{label:<14} {members:>6} members  "
+        f"{elapsed * 1e3 / iterations:>9.3f} ms CPU/fan-out  "
+        f"{elapsed * 1e9 / (iterations * members):>8.1f} ns/socket"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("--message-size", type=int, default=200)
+    args = parser.parse_args()
+
+    event = {
+        "type": "chat_message",
+        "message": "x" * args.message_size,
+        "user_id": 1,
+        "username": "bench",
+        "room_id": 1,
+        "message_id": 123456,
+    }
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    timed("per-consumer", per_consumer, event, args.members, args.iterations)
+    timed("encode-once", encode_once, event, args.members, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
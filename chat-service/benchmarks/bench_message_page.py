@@ -0,0 +1,82 @@
+# chat-service/benchmarks/bench_message_page.py
+"""
+Render time of one history page with per-message translation GETs vs one
+batched MGET (MessageListSerializer).
+
+    python benchmarks/bench_message_page.py --page-size 500 -n 20
+
+Needs Redis (REDIS_HOST). Messages are built in memory; translations for
+every other message are written under a throwaway user id and removed
+afterwards.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "chat_manager.settings")
+django.setup()
+
+from chat.models import Message  # noqa: E402
+from chat.redis_pool import get_redis  # noqa: E402
+from chat.serializers import MessageSerializer  # noqa: E402
+
+BENCH_USER_ID = 987654321
+
+
+def timed(label, fn, iterations, page_size):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(
+        f"{label:<22} {page_size:>5} msgs  {elapsed * 1e3:>9.2f} ms/page  "
+        f"{elapsed * 1e6 / page_size:>8.1f} us/msg"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    messages = [
+        Message(id=i, seq=i, chat_room_id=1, sender_id=1, content=f"message {i}")
+        for i in range(1, args.page_size + 1)
+    ]
+    keys = [f"translation:{BENCH_USER_ID}:{m.id}" for m in messages[::2]]
+    redis_client = get_redis()
+    redis_client.mset({key: "traducido" for key in keys})
+
+    request = SimpleNamespace(
+        user=SimpleNamespace(id=BENCH_USER_ID, is_authenticated=True)
+    )
+    context = {"request": request}
+    try:
+        timed(
+            "per-message GET",
+            lambda: [MessageSerializer(m, context=context).data for m in messages],
+            args.iterations,
+            args.page_size,
+        )
+        timed(
+            "batched MGET",
+            lambda: MessageSerializer(messages, many=True, context=context).data,
+            args.iterations,
+            args.page_size,
+        )
+    finally:
+        redis_client.delete(*keys)
+
+
+if __name__ == "__main__":
+    main()
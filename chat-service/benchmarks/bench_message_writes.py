@@ -0,0 +1,84 @@
+# chat-service/benchmarks/bench_message_writes.py
+"""
+Sustained WebSocket-path inserts/sec: one Message.objects.create per message
+(the previous ChatConsumer.receive path) vs the write-behind MessageWriter.
+
+    python benchmarks/bench_message_writes.py -n 5000 -c 200
+
+Needs the chat database; rows are written to a throwaway room that is
+deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "chat_manager.settings")
+django.setup()
+
+from channels.db import database_sync_to_async  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from chat.message_writer import MessageWriter  # noqa: E402
+from chat.models import ChatRoom, Message  # noqa: E402
+
+
+async def run_concurrently(submit, total, concurrency):
+    remaining = iter(range(total))
+
+    async def worker():
+        for i in remaining:
+            await submit(f"bench message {i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - start
+
+
+async def main(total, concurrency):
+    User = get_user_model()
+    user, _ = await database_sync_to_async(User.objects.get_or_create)(
+        username="bench_writer"
+    )
+    room = await database_sync_to_async(ChatRoom.objects.create)(
+        name="bench room", admin=user
+    )
+
+    create_one = database_sync_to_async(Message.objects.create)
+    elapsed = await run_concurrently(
+        lambda text: create_one(content=text, sender_id=user.id, chat_room_id=room.id),
+        total,
+        concurrency,
+    )
+    print(f"{'per-message create':<24} {total / elapsed:>10.0f} inserts/s")
+
+    writer = MessageWriter(
+        batch_size=settings.MESSAGE_WRITER_BATCH_SIZE,
+        flush_interval=settings.MESSAGE_WRITER_FLUSH_MS / 1000,
+        max_pending=settings.MESSAGE_WRITER_MAX_PENDING,
+    )
+    elapsed = await run_concurrently(
+        lambda text: writer.submit(room.id, user.id, text), total, concurrency
+    )
+    print(
+        f"{'write-behind batches':<24} {total / elapsed:>10.0f} inserts/s "
+        f"({writer.flushed_messages / max(writer.flushed_batches, 1):.1f} msgs/batch)"
+    )
+
+    await database_sync_to_async(room.delete)()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--messages", type=int, default=5000)
+    parser.add_argument("-c", "--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency))
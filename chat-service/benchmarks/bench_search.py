@@ -0,0 +1,113 @@
+# chat-service/benchmarks/bench_search.py
+"""
+Message search latency on a seeded table.
+
+    python benchmarks/bench_search.py --rows 2000000 -n 20
+    python benchmarks/bench_search.py --room <id> --no-seed -n 20
+
+Seeds --rows synthetic messages into a throwaway room with one
+INSERT ... SELECT generate_series, then times full-text (GIN) and
+substring (ILIKE) searches, the latter before and after building the
+room's trigram index. The room and index are dropped afterwards unless
+--keep is given.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "chat_manager.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from chat.models import ChatRoom, Message  # noqa: E402
+from chat.search import search_messages  # noqa: E402
+
+WORDS = [
+    "hello", "meeting", "tomorrow", "deploy", "coffee", "release", "bug",
+    "weekend", "lunch", "review", "merge", "server", "ticket", "holiday",
+    "budget", "design", "invoice", "travel", "launch", "question",
+]  # fmt: skip
+
+
+def seed(room, user, rows):
+    table = Message._meta.db_table
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in WORDS) + "]"
+    pick = f"({words})[1 + floor(random() * {len(WORDS)})::int]"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (chat_room_id, sender_id, content, timestamp, seq) "
+            f"SELECT %s, %s, {pick} || ' ' || {pick} || ' ' || {pick} || ' ' || g, "
+            f"now(), g FROM generate_series(1, %s) g",
+            [room.id, user.id, rows],
+        )
+        cursor.execute(f"ANALYZE {table}")
+    ChatRoom.objects.filter(id=room.id).update(last_seq=rows)
+
+
+def timed(label, fn, iterations):
+    fn()  # warm caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        results, _ = fn()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"{label:<36} {elapsed * 1e3:>9.2f} ms/query  ({len(results)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument("--room", type=int, default=None)
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    user, _ = get_user_model().objects.get_or_create(username="bench_search")
+    if args.room:
+        room = ChatRoom.objects.get(id=args.room)
+    else:
+        room = ChatRoom.objects.create(name="bench search", admin=user)
+    room.members.add(user)
+
+    if not args.no_seed:
+        start = time.perf_counter()
+        seed(room, user, args.rows)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+    try:
+        for text in ("deploy", "coffee review", '"release server"'):
+            timed(
+                f"fts {text!r}",
+                lambda: search_messages(user, text, room_id=room.id),
+                args.iterations,
+            )
+        timed(
+            "substring 'eview', no trigram",
+            lambda: search_messages(user, "eview", room_id=room.id, substring=True),
+            args.iterations,
+        )
+        call_command("create_trigram_index", room.id)
+        timed(
+            "substring 'eview', trigram",
+            lambda: search_messages(user, "eview", room_id=room.id, substring=True),
+            args.iterations,
+        )
+    finally:
+        if not args.keep:
+            call_command("create_trigram_index", room.id, "--drop")
+            if not args.room:
+                room.delete()
+
+
+if __name__ == "__main__":
+    main()
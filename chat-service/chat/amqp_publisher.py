@@ -0,0 +1,153 @@
+# chat-service/chat/amqp_publisher.py
+import asyncio
+import json
+import logging
+
+import aio_pika  # type: ignore
+from aio_pika.pool import Pool  # type: ignore
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AMQPPublisher:
+    """
+    Process-wide async publisher: one robust connection, a bounded pool of
+    channels, and each queue declared once. With `confirms` enabled every
+    publish waits for the broker ack; publish_many pipelines a batch on one
+    channel so confirms are awaited together rather than one by one.
+    publish_coalesced gathers payloads arriving within `linger` seconds into
+    one publish_many, which is how the hot path publishes.
+    """
+
+    def __init__(self, url, pool_size, confirms=False, linger=0):
+        self.url = url
+        self.pool_size = pool_size
+        self.confirms = confirms
+        self.linger = linger
+        self._pending = {}
+        self._connection = None
+        self._channels = None
+        self._declared = set()
+        self._lock = asyncio.Lock()
+        self.in_flight = 0
+        self.published = 0
+        self.failed = 0
+
+    async def _ensure_started(self):
+        if self._channels is not None:
+            return
+        async with self._lock:
+            if self._channels is not None:
+                return
+            connection = await aio_pika.connect_robust(self.url)
+
+            async def new_channel():
+                return await connection.channel(publisher_confirms=self.confirms)
+
+            self._connection = connection
+            self._channels = Pool(new_channel, max_size=self.pool_size)
+            logger.info(f"[AMQPPublisher] Connected with {self.pool_size} channels")
+
+    async def _declare(self, channel, queue_name):
+        if queue_name not in self._declared:
+            await channel.declare_queue(queue_name, durable=True)
+            self._declared.add(queue_name)
+
+    async def publish(self, queue_name, payload):
+        await self.publish_many(queue_name, [payload])
+
+    async def publish_many(self, queue_name, payloads):
+        await self._ensure_started()
+        self.in_flight += len(payloads)
+        try:
+            async with self._channels.acquire() as channel:
+                if channel.is_closed:
+                    await channel.reopen()
+                await self._declare(channel, queue_name)
+                await asyncio.gather(
+                    *[
+                        channel.default_exchange.publish(
+                            aio_pika.Message(
+                                body=json.dumps(payload).encode(),
+                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                                content_type="application/json",
+                            ),
+                            routing_key=queue_name,
+                        )
+                        for payload in payloads
+                    ]
+                )
+            self.published += len(payloads)
+        except Exception:
+            self.failed += len(payloads)
+            raise
+        finally:
+            self.in_flight -= len(payloads)
+
+    async def publish_coalesced(self, queue_name, payload):
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(queue_name, [])
+        pending.append((payload, future))
+        if len(pending) == 1:
+            asyncio.ensure_future(self._flush_later(queue_name))
+        await future
+
+    async def _flush_later(self, queue_name):
+        await asyncio.sleep(self.linger)
+        batch = self._pending.pop(queue_name, [])
+        try:
+            await self.publish_many(queue_name, [payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self):
+        if self._channels is not None:
+            await self._channels.close()
+            await self._connection.close()
+            self._channels = None
+            self._connection = None
+            self._declared.clear()
+
+    def metrics(self):
+        return {
+            "in_flight": self.in_flight,
+            "published": self.published,
+            "failed": self.failed,
+        }
+
+
+# One publisher per event loop; daphne runs a single loop per process.
+_publisher = None
+_publisher_loop = None
+
+
+def get_publisher():
+    global _publisher, _publisher_loop
+    loop = asyncio.get_running_loop()
+    if _publisher is None or _publisher_loop is not loop:
+        _publisher = AMQPPublisher(
+            url="amqp://{user}:{pwd}@{host}:{port}/".format(
+                user=settings.RABBITMQ_USER,
+                pwd=settings.RABBITMQ_PASSWORD,
+                host=settings.RABBITMQ_HOST,
+                port=settings.RABBITMQ_PORT,
+            ),
+            pool_size=settings.AMQP_CHANNEL_POOL_SIZE,
+            confirms=settings.AMQP_PUBLISHER_CONFIRMS,
+            linger=settings.AMQP_PUBLISH_LINGER_MS / 1000,
+        )
+        _publisher_loop = loop
+    return _publisher
+
+
+def publisher_metrics():
+    if _publisher is None:
+        return {"in_flight": 0, "published": 0, "failed": 0}
+    return _publisher.metrics()
@@ -0,0 +1,102 @@
+# chat-service/chat/archive.py
+import gzip
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+
+def archive_path(room_id, month):
+    """Relative path of one room-month archive: <room_id>/<YYYY-MM>.ndjson.gz"""
+    return f"{room_id}/{month:%Y-%m}.ndjson.gz"
+
+
+def write_archive(relative_path, rows):
+    """
+    Write serialized rows (ascending seq) as gzip NDJSON. The file is
+    written next to its target and renamed, so readers never see a partial
+    archive.
+    """
+    target = Path(settings.MESSAGE_ARCHIVE_DIR) / relative_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row))
+            f.write("\n")
+    os.replace(tmp, target)
+
+
+def load_archive(relative_path):
+    """All rows of one archive, ascending seq."""
+    path = Path(settings.MESSAGE_ARCHIVE_DIR) / relative_path
+    # Keyed on mtime: a month rewritten by archive_messages in another
+    # process is reloaded rather than served from this process's cache.
+    return _load(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _load(path, mtime_ns):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return tuple(json.loads(line) for line in f if line.strip())
+
+
+def iter_archive(relative_path):
+    """Rows of one archive one at a time, bypassing the cache."""
+    path = Path(settings.MESSAGE_ARCHIVE_DIR) / relative_path
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def remove_archive(relative_path):
+    try:
+        os.remove(Path(settings.MESSAGE_ARCHIVE_DIR) / relative_path)
+    except FileNotFoundError:
+        pass
+
+
+def has_archived_before(room_id, before):
+    """Whether any archived row of the room precedes seq `before`."""
+    from chat.models import ArchivedRange
+
+    return ArchivedRange.objects.filter(
+        chat_room_id=room_id, first_seq__lt=before
+    ).exists()
+
+
+def read_archived(room_id, before=None, after=None, limit=50):
+    """
+    Archived rows of a room as (rows, has_more), rows in ascending seq.
+    With `after`, the oldest `limit` rows after that seq; otherwise the
+    newest `limit` rows before `before` (or before the hot table). Only
+    archives overlapping the requested side are opened.
+    """
+    from chat.models import ArchivedRange
+
+    ranges = ArchivedRange.objects.filter(chat_room_id=room_id)
+    collected = []
+    if after is not None:
+        for archived in ranges.filter(last_seq__gt=after).order_by("first_seq"):
+            collected.extend(
+                row for row in load_archive(archived.path) if row["seq"] > after
+            )
+            if len(collected) > limit:
+                break
+        return collected[:limit], len(collected) > limit
+
+    if before is not None:
+        ranges = ranges.filter(first_seq__lt=before)
+    for archived in ranges.order_by("-last_seq"):
+        rows = load_archive(archived.path)
+        collected.extend(
+            row for row in reversed(rows) if before is None or row["seq"] < before
+        )
+        if len(collected) > limit:
+            break
+    page = collected[:limit]
+    page.reverse()
+    return page, len(collected) > limit
@@ -0,0 +1,130 @@
+# chat-service/chat/auth_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "auth:token:"
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries also expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Built lazily: chat_manager.settings imports chat.utils, which imports us.
+_local_cache = None
+
+
+def get_local_cache():
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = TTLCache(
+            maxsize=settings.AUTH_CACHE_LOCAL_MAXSIZE,
+            ttl=settings.AUTH_CACHE_LOCAL_TTL,
+        )
+    return _local_cache
+
+
+def hash_token(token):
+    """
+    Tokens are never stored as-is; every cache tier is keyed by their SHA-256.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_user_info(token):
+    """
+    Look the token up in the in-process cache first, then in Redis.
+    Returns the cached user info dict or None on a miss.
+    """
+    token_hash = hash_token(token)
+    user_info = get_local_cache().get(token_hash)
+    if user_info is not None:
+        return user_info
+
+    try:
+        raw = get_redis().get(REDIS_KEY_PREFIX + token_hash)
+    except Exception as e:
+        logger.error(f"[get_cached_user_info] Redis error: {e}")
+        return None
+    if raw is None:
+        return None
+
+    user_info = json.loads(raw)
+    get_local_cache().set(token_hash, user_info)
+    return user_info
+
+
+def cache_user_info(token, user_info):
+    """
+    Store the introspection result for a valid token in both tiers.
+    """
+    token_hash = hash_token(token)
+    get_local_cache().set(token_hash, user_info)
+    try:
+        get_redis().set(
+            REDIS_KEY_PREFIX + token_hash,
+            json.dumps(user_info),
+            ex=settings.AUTH_CACHE_REDIS_TTL,
+        )
+    except Exception as e:
+        logger.error(f"[cache_user_info] Redis error: {e}")
+
+
+def invalidate_token_hash(token_hash):
+    """
+    Drop a revoked token from both tiers. Other processes keep their local
+    copy for at most AUTH_CACHE_LOCAL_TTL seconds, which bounds revocation lag.
+    """
+    get_local_cache().delete(token_hash)
+    try:
+        get_redis().delete(REDIS_KEY_PREFIX + token_hash)
+    except Exception as e:
+        logger.error(f"[invalidate_token_hash] Redis error: {e}")
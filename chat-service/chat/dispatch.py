@@ -20,6 +20,9 @@ TRANSLATION_REQUEST_QUEUE = "translation_request_queue"
 TRANSLATION_COMPLETED_QUEUE = "translation_completed_queue"
 LANGUAGE_CHANGE_NOTIFICATIONS_QUEUE = "language_change_notifications"
 ROOM_RENAMED_NOTIFICATIONS_QUEUE = "room_renamed_notifications"
+# published by users-management-service
+USER_LOGGED_OUT_QUEUE = "user_logged_out_queue"
+USER_EVENTS_QUEUE = "user_events_queue"
 
 
 def get_rabbit_connection():
@@ -0,0 +1,107 @@
+# chat-service/chat/export.py
+import asyncio
+import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+
+from chat.archive import iter_archive
+from chat.models import ArchivedRange, Message
+from chat.serializers import MessageSerializer
+from chat.translation_handler import get_translated_results_from_cache
+
+
+def _translated(rows, user_id):
+    if user_id is None or not rows:
+        return rows
+    translations = get_translated_results_from_cache(
+        [row["id"] for row in rows], user_id
+    )
+    return [
+        {**row, "content": translations.get(row["id"], row["content"])} for row in rows
+    ]
+
+
+def export_chunks(room_id, user_id=None, chunk_size=None):
+    """
+    A room's whole history in ascending seq as lists of serialized rows,
+    archived months first. Archive files are read line by line and table
+    rows through a server-side cursor, so memory stays at one chunk however
+    long the room is. With
+    `user_id`, that user's translations replace content, one MGET per chunk.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    for archived in ArchivedRange.objects.filter(chat_room_id=room_id).order_by(
+        "first_seq"
+    ):
+        # Streamed rather than loaded: a whole month must not sit in memory,
+        # nor push the months paging needs out of load_archive's cache.
+        chunk = []
+        for row in iter_archive(archived.path):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield _translated(chunk, user_id)
+                chunk = []
+        if chunk:
+            yield _translated(chunk, user_id)
+
+    messages = (
+        Message.objects.filter(chat_room_id=room_id)
+        .defer("search_vector")
+        .order_by(F("seq").asc(nulls_first=True), "timestamp")
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for message in messages:
+        chunk.append(message)
+        if len(chunk) == chunk_size:
+            yield _translated(MessageSerializer(chunk, many=True).data, user_id)
+            chunk = []
+    if chunk:
+        yield _translated(MessageSerializer(chunk, many=True).data, user_id)
+
+
+def ndjson_stream(chunks, compress=False):
+    """Encode row chunks as NDJSON bytes, one piece per chunk; gzip-framed
+    when `compress` is set."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    for rows in chunks:
+        data = "".join(json.dumps(row) + "\n" for row in rows).encode()
+        if compressor:
+            data = compressor.compress(data)
+            if not data:
+                continue
+        yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def _close(iterator):
+    close = getattr(iterator, "close", None)
+    if close:
+        close()
+    connection.close()
+
+
+async def aiter_sync(iterator):
+    """
+    Drive a blocking iterator from async code one item at a time. Under
+    ASGI, StreamingHttpResponse would otherwise read a sync iterator into a
+    list before sending anything. Every step runs on one worker thread owned
+    by this export, so the server-side cursor stays on that thread's own
+    connection, which nothing else can close mid-stream.
+    """
+    iterator = iter(iterator)
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="export") as worker:
+        try:
+            while True:
+                item = await loop.run_in_executor(worker, next, iterator, None)
+                if item is None:
+                    return
+                yield item
+        finally:
+            await loop.run_in_executor(worker, _close, iterator)
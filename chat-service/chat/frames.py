@@ -0,0 +1,53 @@
+# chat-service/chat/frames.py
+import json
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Channel-layer event type carrying an already encoded WebSocket frame.
+BROADCAST_EVENT = "broadcast_frame"
+
+
+def encode_frame(frame):
+    """
+    Encode a client frame to JSON text, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(frame).decode()
+    return json.dumps(frame)
+
+
+def broadcast_event(frame):
+    """
+    Wrap a frame for group_send so it is serialized once by the sender and
+    forwarded verbatim by every consumer in the group.
+    """
+    return {"type": BROADCAST_EVENT, "text": encode_frame(frame)}
+
+
+def chat_message_frame(
+    message, user_id, username, room_id, message_id, timestamp=None, seq=None
+):
+    return {
+        "type": "chat_message",
+        "message": message,
+        "user_id": user_id,
+        "username": username,
+        "room_id": room_id,
+        "message_id": message_id,
+        "seq": seq,
+        "timestamp": timestamp,
+    }
+
+
+def translation_update_frame(message, message_id, room_id, user_id, timestamp=None):
+    return {
+        "type": "translation_update",
+        "message": message,
+        "message_id": message_id,
+        "room_id": room_id,
+        "user_id": user_id,
+        "timestamp": timestamp,
+    }
@@ -0,0 +1,136 @@
+# chat-service/chat/history_cache.py
+import json
+import logging
+import time
+
+import redis  # type: ignore
+from django.conf import settings
+
+from chat.redis_pool import get_async_redis, get_redis
+from chat.versions import queue_bump_room
+
+logger = logging.getLogger(__name__)
+
+# How long a cache miss waits for another request that is already filling.
+FILL_WAIT_STEPS = 10
+FILL_WAIT_INTERVAL = 0.02
+
+
+def history_key(room_id):
+    return f"room_history:{room_id}"
+
+
+def _version_key(room_id):
+    return f"room_history:{room_id}:v"
+
+
+def _lock_key(room_id):
+    return f"room_history:{room_id}:lock"
+
+
+def _decode(values):
+    # A message committed just before a fill can also be appended after it,
+    # and writers in different processes may append slightly out of order.
+    rows = {}
+    for value in values:
+        row = json.loads(value)
+        rows[row["id"]] = row
+    return sorted(rows.values(), key=lambda row: row["seq"] or 0)
+
+
+def get_recent_messages(room_id, count, load):
+    """
+    The room's newest `count` serialized messages (untranslated, ascending
+    seq), or None when `count` exceeds what the cache holds.
+
+    On a miss one caller takes a short lock and fills the cache from
+    `load()`; concurrent callers wait for it briefly instead of all hitting
+    the database. The fill is dropped if a message was appended meanwhile,
+    so the cache never misses a write.
+    """
+    size = settings.ROOM_HISTORY_CACHE_SIZE
+    if count > size:
+        return None
+    client = get_redis()
+    key = history_key(room_id)
+    try:
+        values = client.lrange(key, 0, -1)
+        if values:
+            return _decode(values)[-count:]
+
+        if not client.set(_lock_key(room_id), 1, nx=True, ex=5):
+            for _ in range(FILL_WAIT_STEPS):
+                time.sleep(FILL_WAIT_INTERVAL)
+                values = client.lrange(key, 0, -1)
+                if values:
+                    return _decode(values)[-count:]
+            return load()[-count:]
+
+        try:
+            return _fill(client, room_id, load)[-count:]
+        finally:
+            client.delete(_lock_key(room_id))
+    except redis.RedisError as e:
+        logger.error(f"[get_recent_messages] Redis error for room {room_id}: {e}")
+        return load()[-count:]
+
+
+def _fill(client, room_id, load):
+    key = history_key(room_id)
+    version = client.get(_version_key(room_id))
+    rows = load()
+    if not rows:
+        return rows
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(_version_key(room_id))
+            if pipe.get(_version_key(room_id)) != version:
+                return rows
+            pipe.multi()
+            pipe.delete(key)
+            pipe.rpush(key, *[json.dumps(row) for row in rows])
+            pipe.expire(key, settings.ROOM_HISTORY_CACHE_TTL)
+            pipe.execute()
+        except redis.WatchError:
+            pass
+    return rows
+
+
+def _queue_append(pipe, room_id, row):
+    key = history_key(room_id)
+    # RPUSHX: a cold room stays cold until a reader fills it from the database.
+    pipe.rpushx(key, json.dumps(row))
+    pipe.ltrim(key, -settings.ROOM_HISTORY_CACHE_SIZE, -1)
+    pipe.incr(_version_key(room_id))
+    pipe.expire(_version_key(room_id), settings.ROOM_HISTORY_CACHE_TTL)
+    # Same round trip: a new message also changes the history ETag.
+    queue_bump_room(pipe, room_id)
+
+
+def append_message_sync(room_id, row):
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        _queue_append(pipe, room_id, row)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"[append_message] Redis error for room {room_id}: {e}")
+
+
+async def append_message(room_id, row):
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            _queue_append(pipe, room_id, row)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"[append_message] Redis error for room {room_id}: {e}")
+
+
+def invalidate_room_history(room_id):
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.delete(history_key(room_id))
+        pipe.incr(_version_key(room_id))
+        pipe.expire(_version_key(room_id), settings.ROOM_HISTORY_CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"[invalidate_room_history] Redis error for room {room_id}: {e}")
@@ -0,0 +1,120 @@
+# chat/management/commands/archive_messages.py
+
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from chat.archive import archive_path, load_archive, write_archive
+from chat.history_cache import invalidate_room_history
+from chat.models import ArchivedRange, Message
+from chat.serializers import MessageSerializer
+from chat.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = "Move whole months of messages older than the retention horizon into per-room gzip NDJSON archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.MESSAGE_RETENTION_DAYS,
+            help="Retention horizon; only months entirely older than it are archived.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        horizon = (now - timedelta(days=options["older_than_days"])).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        old = Message.objects.filter(timestamp__lt=horizon, seq__isnull=False)
+        # Archive up to the newest old seq per room, so every archived seq
+        # is below every seq left in the table and paging stays contiguous.
+        cutoffs = dict(
+            old.values("chat_room_id")
+            .annotate(cutoff=Max("seq"))
+            .values_list("chat_room_id", "cutoff")
+        )
+        total = 0
+        for room_id, cutoff in sorted(cutoffs.items()):
+            total += self.archive_room(room_id, cutoff)
+            invalidate_room_history(room_id)
+            bump_versions(room_ids=[room_id])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {total} messages from {len(cutoffs)} rooms.")
+        )
+
+    def archive_room(self, room_id, cutoff):
+        messages = Message.objects.filter(
+            chat_room_id=room_id, seq__lte=cutoff
+        ).annotate(month=TruncMonth("timestamp"))
+        months = messages.order_by("month").values_list("month", flat=True).distinct()
+
+        with transaction.atomic():
+            for month in months:
+                # One month is read through a server-side cursor and written
+                # as it streams, so memory stays at one chunk.
+                rows = self.serialized(
+                    messages.filter(month=month)
+                    .order_by("seq")
+                    .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+                )
+                path = archive_path(room_id, month.date())
+                existing = ArchivedRange.objects.filter(
+                    chat_room_id=room_id, month=month.date()
+                ).first()
+                if existing:
+                    rows = self.merged(load_archive(existing.path), rows)
+                stats = {"count": 0}
+                # Files are written before the rows go; a failure leaves the
+                # rows in place and a rerun rewrites the same files.
+                write_archive(path, self.counted(rows, stats))
+                ArchivedRange.objects.update_or_create(
+                    chat_room_id=room_id,
+                    month=month.date(),
+                    defaults={
+                        "first_seq": stats["first"],
+                        "last_seq": stats["last"],
+                        "message_count": stats["count"],
+                        "path": path,
+                    },
+                )
+            _, deleted = Message.objects.filter(
+                chat_room_id=room_id, seq__lte=cutoff
+            ).delete()
+        return deleted.get(Message._meta.label, 0)
+
+    @staticmethod
+    def serialized(messages):
+        chunk = []
+        for message in messages:
+            chunk.append(message)
+            if len(chunk) == settings.EXPORT_CHUNK_SIZE:
+                yield from MessageSerializer(chunk, many=True).data
+                chunk = []
+        yield from MessageSerializer(chunk, many=True).data
+
+    @staticmethod
+    def merged(existing, rows):
+        # Keyed by seq, so a rerun after a failed delete does not duplicate
+        # rows already in the file; the fresh row wins.
+        previous = None
+        for row in heapq.merge(rows, existing, key=lambda r: r["seq"]):
+            if previous is not None and row["seq"] == previous["seq"]:
+                continue
+            previous = row
+            yield row
+
+    @staticmethod
+    def counted(rows, stats):
+        for row in rows:
+            stats.setdefault("first", row["seq"])
+            stats["last"] = row["seq"]
+            stats["count"] += 1
+            yield dict(row)
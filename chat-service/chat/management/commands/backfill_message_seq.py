@@ -0,0 +1,43 @@
+# chat/management/commands/backfill_message_seq.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Min
+from chat.models import ChatRoom, Message
+
+
+class Command(BaseCommand):
+    help = "Number messages written before per-room seq existed, oldest first, below the room's numbered messages."
+
+    def handle(self, *args, **options):
+        room_ids = (
+            Message.objects.filter(seq__isnull=True)
+            .values_list("chat_room_id", flat=True)
+            .distinct()
+        )
+        total = 0
+        for room_id in list(room_ids):
+            with transaction.atomic():
+                # Lock the room so live inserts wait for the numbering.
+                ChatRoom.objects.select_for_update().get(id=room_id)
+                legacy = list(
+                    Message.objects.filter(chat_room_id=room_id, seq__isnull=True)
+                    .order_by("timestamp", "id")
+                    .only("id")
+                )
+                lowest = Message.objects.filter(chat_room_id=room_id).aggregate(
+                    lowest=Min("seq")
+                )["lowest"]
+                if lowest is None:
+                    first = ChatRoom.allocate_seqs(room_id, len(legacy))
+                else:
+                    # Numbered seqs are already held by clients as cursors,
+                    # resume points and read marks, so they never move;
+                    # legacy rows predate them and go below, even past zero.
+                    first = lowest - len(legacy)
+                for seq, message in enumerate(legacy, start=first):
+                    message.seq = seq
+                Message.objects.bulk_update(legacy, ["seq"], batch_size=1000)
+            total += len(legacy)
+
+        self.stdout.write(self.style.SUCCESS(f"Numbered {total} messages."))
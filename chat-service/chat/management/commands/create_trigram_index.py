@@ -0,0 +1,37 @@
+# chat/management/commands/create_trigram_index.py
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from chat.models import Message
+
+
+class Command(BaseCommand):
+    help = "Create (or drop) a per-room trigram index so substring search in busy rooms avoids a sequential scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument("room_ids", nargs="+", type=int)
+        parser.add_argument("--drop", action="store_true")
+
+    def handle(self, *args, **options):
+        table = connection.ops.quote_name(Message._meta.db_table)
+        # CONCURRENTLY cannot run inside a transaction, so each statement
+        # runs in autocommit.
+        with connection.cursor() as cursor:
+            if not options["drop"]:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for room_id in options["room_ids"]:
+                name = connection.ops.quote_name(f"chat_message_trgm_room_{room_id}")
+                if options["drop"]:
+                    cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    self.stdout.write(f"Dropped trigram index for room {room_id}.")
+                    continue
+                # Django compiles icontains to UPPER(content) LIKE UPPER(...),
+                # so the index is on the same expression.
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+                    f"USING gin (UPPER(content) gin_trgm_ops) "
+                    f"WHERE chat_room_id = {int(room_id)}"
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f"Trigram index ready for room {room_id}.")
+                )
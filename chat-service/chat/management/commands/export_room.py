@@ -0,0 +1,40 @@
+# chat/management/commands/export_room.py
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from chat.export import export_chunks, ndjson_stream
+from chat.models import ChatRoom
+
+
+class Command(BaseCommand):
+    help = "Stream a room's whole history, archived months included, as NDJSON (optionally gzip) to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("room_id", type=int)
+        parser.add_argument("--output", help="File to write; stdout when omitted.")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        room_id = options["room_id"]
+        if not ChatRoom.objects.filter(id=room_id).exists():
+            raise CommandError(f"Room {room_id} does not exist.")
+
+        stream = ndjson_stream(
+            export_chunks(room_id, chunk_size=options["chunk_size"]),
+            compress=options["gzip"],
+        )
+        output = options["output"]
+        out = open(output, "wb") if output else sys.stdout.buffer
+        try:
+            for piece in stream:
+                out.write(piece)
+        finally:
+            if output:
+                out.close()
+
+        if output:
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported room {room_id} to {output}.")
+            )
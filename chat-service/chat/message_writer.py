@@ -0,0 +1,165 @@
+# chat-service/chat/message_writer.py
+import asyncio
+import logging
+from collections import Counter
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """
+    Write-behind buffer for WebSocket messages.
+
+    Consumers submit a message and await its saved instance; a single
+    background task drains the queue and persists up to `batch_size`
+    messages per bulk_create, waiting at most `flush_interval` seconds to
+    fill a batch. One writer per process inserts in submission order, so ids
+    (and therefore per-room order) follow the order messages were received.
+    The queue is bounded: when `max_pending` messages are waiting, submit()
+    blocks, which stops the consumer from reading its socket.
+    """
+
+    def __init__(self, batch_size, flush_interval, max_pending):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._task = None
+        self.flushed_batches = 0
+        self.flushed_messages = 0
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    async def submit(self, room_id, user_id, content):
+        from chat.models import Message
+
+        future = asyncio.get_running_loop().create_future()
+        message = Message(content=content, sender_id=user_id, chat_room_id=room_id)
+        await self._queue.put((message, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        messages = [message for message, _ in batch]
+        try:
+            failures = await database_sync_to_async(self._persist)(messages)
+        except Exception as e:
+            logger.exception(f"[MessageWriter] Failed to persist {len(batch)}: {e}")
+            failures = {id(message): e for message in messages}
+        self.flushed_batches += 1
+        self.flushed_messages += len(messages) - len(failures)
+        for message, future in batch:
+            if future.done():
+                continue
+            error = failures.get(id(message))
+            if error is None:
+                future.set_result(message)
+            else:
+                future.set_exception(error)
+
+    @classmethod
+    def _persist(cls, messages):
+        """
+        Insert a batch; returns {id(message): exception} for the messages
+        that could not be saved. If the batch fails as a whole it is retried
+        one room at a time, then one message at a time, so a bad row only
+        fails its own sender.
+        """
+        from chat.models import ChatRoom
+
+        failures = {}
+
+        def insert(group):
+            for message in cls._bulk_insert(group) or ():
+                failures[id(message)] = ChatRoom.DoesNotExist(
+                    f"Room {message.chat_room_id} no longer exists."
+                )
+
+        try:
+            insert(messages)
+            return failures
+        except Exception as e:
+            logger.warning(f"[MessageWriter] Batch insert failed, splitting: {e}")
+        by_room = {}
+        for message in messages:
+            by_room.setdefault(message.chat_room_id, []).append(message)
+        for room_messages in by_room.values():
+            try:
+                insert(room_messages)
+                continue
+            except Exception:
+                pass
+            for message in room_messages:
+                try:
+                    insert([message])
+                except Exception as e:
+                    logger.error(f"[MessageWriter] Dropping message: {e}")
+                    failures[id(message)] = e
+        return failures
+
+    @staticmethod
+    def _bulk_insert(messages):
+        """Insert messages; returns those dropped because their room is gone."""
+        from chat.models import ChatRoom, Message
+
+        counts = Counter(message.chat_room_id for message in messages)
+        existing = set(
+            ChatRoom.objects.filter(id__in=counts).values_list("id", flat=True)
+        )
+        dropped = [m for m in messages if m.chat_room_id not in existing]
+        messages = [m for m in messages if m.chat_room_id in existing]
+        with transaction.atomic():
+            # Rooms are locked in id order so concurrent writers cannot deadlock.
+            next_seq = {
+                room_id: ChatRoom.allocate_seqs(room_id, count)
+                for room_id, count in sorted(counts.items())
+                if room_id in existing
+            }
+            for message in messages:
+                message.seq = next_seq[message.chat_room_id]
+                next_seq[message.chat_room_id] += 1
+            # PostgreSQL returns the assigned ids, which bulk_create sets in place.
+            Message.objects.bulk_create(messages)
+        return dropped
+
+
+# One writer per event loop; daphne runs a single loop per process.
+_writer = None
+_writer_loop = None
+
+
+def get_message_writer():
+    global _writer, _writer_loop
+    loop = asyncio.get_running_loop()
+    if _writer is None or _writer_loop is not loop:
+        _writer = MessageWriter(
+            batch_size=settings.MESSAGE_WRITER_BATCH_SIZE,
+            flush_interval=settings.MESSAGE_WRITER_FLUSH_MS / 1000,
+            max_pending=settings.MESSAGE_WRITER_MAX_PENDING,
+        )
+        _writer_loop = loop
+    return _writer
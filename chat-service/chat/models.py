@@ -1,11 +1,21 @@
 # chat/models.py
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
-from django.db.models.signals import m2m_changed
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
 # Import the new publisher function from dispatch.py
 from .dispatch import publish_user_invited
+from .versions import bump_versions
 
 User = get_user_model()
 
@@ -16,16 +26,154 @@ class ChatRoom(models.Model):
     admin = models.ForeignKey(
         User, related_name="admin_rooms", on_delete=models.CASCADE
     )
+    # Highest message seq handed out in this room
+    last_seq = models.BigIntegerField(default=0)
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def allocate_seqs(room_id, count=1):
+        """
+        Reserve `count` consecutive message seqs in the room; returns the first.
+        Call inside the transaction that inserts the messages: the row lock
+        taken by the UPDATE is held until commit, so seqs become visible in
+        allocation order.
+        """
+        ChatRoom.objects.filter(id=room_id).update(last_seq=F("last_seq") + count)
+        last_seq = (
+            ChatRoom.objects.filter(id=room_id).values_list("last_seq", flat=True).get()
+        )
+        return last_seq - count + 1
+
 
 class Message(models.Model):
     chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE)
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Per-room position, 1-based and gap-free among committed messages;
+    # rows backfilled by backfill_message_seq may sit at or below zero.
+    # Nullable only so the column can be added to existing tables.
+    seq = models.BigIntegerField(null=True)
+    # Kept up to date by PostgreSQL itself. The "simple" config does no
+    # stemming, since rooms mix languages.
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chat_room", "seq"], name="unique_message_seq_per_room"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["chat_room", "id"]),
+            GinIndex(fields=["search_vector"], name="message_search_gin"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.seq is None:
+            with transaction.atomic():
+                self.seq = ChatRoom.allocate_seqs(self.chat_room_id)
+                super().save(*args, **kwargs)
+            return
+        super().save(*args, **kwargs)
+
+
+# Advisory lock key serializing RoomEvent inserts
+EVENT_LOG_LOCK = 7_020_001
+
+
+class RoomEvent(models.Model):
+    """
+    Append-only log of room changes other than messages, read by the sync
+    endpoint. Ids are plain integers so events outlive deleted rooms.
+    user_id is the affected member for membership events and the recipient
+    for deletions (one row per former member).
+    """
+
+    RENAMED = "renamed"
+    MEMBER_ADDED = "member_added"
+    MEMBER_REMOVED = "member_removed"
+    DELETED = "deleted"
+
+    room_id = models.IntegerField()
+    user_id = models.IntegerField(null=True)
+    kind = models.CharField(max_length=20)
+    name = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["room_id", "id"]),
+            models.Index(fields=["user_id", "id"]),
+        ]
+
+    @staticmethod
+    def log(events):
+        """
+        Insert events so their ids become visible in id order, which the
+        sync cursor relies on. The transaction-level advisory lock makes
+        writers take ids one transaction at a time, each holding the lock
+        until it commits. Events are rare, so the serialization is cheap.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [EVENT_LOG_LOCK])
+            RoomEvent.objects.bulk_create(events)
+
+
+class RoomReadState(models.Model):
+    """
+    Last message seq a user has read in a room. Marks live in Redis and are
+    written back here periodically by chat.read_marks.
+    """
+
+    user = models.ForeignKey(
+        User, related_name="room_read_states", on_delete=models.CASCADE
+    )
+    chat_room = models.ForeignKey(
+        ChatRoom, related_name="read_states", on_delete=models.CASCADE
+    )
+    last_read_seq = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "chat_room"], name="unique_read_state_per_user_room"
+            )
+        ]
+
+
+class ArchivedRange(models.Model):
+    """
+    One room-month of messages moved out of chat_message into a gzip NDJSON
+    file under MESSAGE_ARCHIVE_DIR by the archive_messages command. Seqs of
+    archived rows are all lower than the room's rows still in the table.
+    """
+
+    chat_room = models.ForeignKey(
+        ChatRoom, related_name="archived_ranges", on_delete=models.CASCADE
+    )
+    month = models.DateField()
+    first_seq = models.BigIntegerField()
+    last_seq = models.BigIntegerField()
+    message_count = models.IntegerField()
+    path = models.CharField(max_length=255)
+    archived_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chat_room", "month"], name="unique_archive_per_room_month"
+            )
+        ]
+        indexes = [models.Index(fields=["chat_room", "last_seq"])]
 
 
 @receiver(m2m_changed, sender=ChatRoom.members.through)
@@ -35,6 +183,20 @@ def notify_user_added_to_room(sender, instance, action, pk_set, **kwargs):
     When new users are added (post_add), publish an event to RabbitMQ
     indicating the user was invited to the room.
     """
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(
+            lambda: bump_versions(room_ids=[instance.id], user_ids=pk_set or ())
+        )
+    if action in ("post_add", "post_remove") and pk_set:
+        kind = (
+            RoomEvent.MEMBER_ADDED if action == "post_add" else RoomEvent.MEMBER_REMOVED
+        )
+        RoomEvent.log(
+            [
+                RoomEvent(room_id=instance.id, user_id=user_id, kind=kind)
+                for user_id in pk_set
+            ]
+        )
     if action == "post_add":
         for user_id in pk_set:
             # Avoid notifying the room admin about being added to their own room
@@ -42,3 +204,54 @@ def notify_user_added_to_room(sender, instance, action, pk_set, **kwargs):
                 publish_user_invited(
                     user_id=user_id, room_id=instance.id, room_name=instance.name
                 )
+
+
+@receiver(pre_save, sender=ChatRoom)
+def remember_room_name(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_name = (
+            ChatRoom.objects.filter(pk=instance.pk)
+            .values_list("name", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=ChatRoom)
+def bump_room_versions_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_name", None)
+    if not created and previous is not None and previous != instance.name:
+        RoomEvent.log(
+            [RoomEvent(room_id=instance.id, kind=RoomEvent.RENAMED, name=instance.name)]
+        )
+    member_ids = list(instance.members.values_list("id", flat=True))
+    transaction.on_commit(
+        lambda: bump_versions(room_ids=[instance.id], user_ids=member_ids)
+    )
+
+
+@receiver(pre_delete, sender=ChatRoom)
+def remember_room_members(sender, instance, **kwargs):
+    instance._member_ids = list(instance.members.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=ChatRoom)
+def bump_room_versions_on_delete(sender, instance, **kwargs):
+    member_ids = getattr(instance, "_member_ids", [])
+    room_id = instance.id
+    RoomEvent.log(
+        [
+            RoomEvent(room_id=room_id, user_id=user_id, kind=RoomEvent.DELETED)
+            for user_id in member_ids
+        ]
+    )
+    transaction.on_commit(
+        lambda: bump_versions(room_ids=[room_id], user_ids=member_ids)
+    )
+
+
+@receiver(post_delete, sender=ArchivedRange)
+def remove_archive_file(sender, instance, **kwargs):
+    from .archive import remove_archive
+
+    path = instance.path
+    transaction.on_commit(lambda: remove_archive(path))
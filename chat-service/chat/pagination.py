@@ -0,0 +1,103 @@
+# chat-service/chat/pagination.py
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+from chat.archive import has_archived_before, read_archived
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+
+class MessageKeysetPagination(BasePagination):
+    """
+    Keyset pagination over one room's messages by seq, served from the
+    unique (chat_room, seq) index so every page costs the same.
+
+    No cursor returns the newest page, `before=<seq>` the page of older
+    messages and `after=<seq>` the page of newer ones. Results are always in
+    ascending seq order; pass the response's `before` / `after` back to keep
+    paging. `page_size` is capped at MESSAGE_PAGE_SIZE_MAX. Ranges moved out
+    by archive_messages are read back from their archive files.
+    """
+
+    def get_page_size(self, request):
+        page_size = _int_param(request, "page_size") or settings.MESSAGE_PAGE_SIZE
+        return max(1, min(page_size, settings.MESSAGE_PAGE_SIZE_MAX))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        before = _int_param(request, "before")
+        after = _int_param(request, "after")
+        if before is not None and after is not None:
+            raise ValidationError("Pass either before or after, not both.")
+
+        room_id = request.query_params.get("chat_room")
+        # Archived rows (already serialized) always precede the table rows.
+        self.archived = []
+        if after is not None:
+            self.archived, archived_more = read_archived(
+                room_id, after=after, limit=page_size
+            )
+            if self.archived:
+                after = self.archived[-1]["seq"]
+            remaining = page_size - len(self.archived)
+            if archived_more:
+                rows, self.has_more = [], True
+            else:
+                rows = list(
+                    queryset.filter(seq__gt=after).order_by("seq")[: remaining + 1]
+                )
+                self.has_more = len(rows) > remaining
+                rows = rows[:remaining]
+        else:
+            if before is not None:
+                queryset = queryset.filter(seq__lt=before)
+            else:
+                queryset = queryset.filter(seq__isnull=False)
+            rows = list(queryset.order_by("-seq")[: page_size + 1])
+            self.has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            rows.reverse()
+            if not self.has_more and len(rows) < page_size:
+                # The table ran out; continue into the room's archive.
+                self.archived, self.has_more = read_archived(
+                    room_id,
+                    before=rows[0].seq if rows else before,
+                    limit=page_size - len(rows),
+                )
+            elif not self.has_more:
+                # The table ran out on a full page; older rows may be archived.
+                self.has_more = has_archived_before(room_id, rows[0].seq)
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        results = list(self.archived) + list(data)
+        return Response(
+            {
+                "results": results,
+                "has_more": self.has_more,
+                "before": results[0]["seq"] if results else None,
+                "after": results[-1]["seq"] if results else None,
+            }
+        )
+
+    def get_cached_page_response(self, rows, page_size):
+        """Newest-page response built from already serialized rows."""
+        return Response(
+            {
+                "results": rows,
+                "has_more": len(rows) == page_size,
+                "before": rows[0]["seq"] if rows else None,
+                "after": rows[-1]["seq"] if rows else None,
+            }
+        )
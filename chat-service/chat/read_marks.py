@@ -0,0 +1,183 @@
+# chat-service/chat/read_marks.py
+import logging
+import time
+
+import redis  # type: ignore
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import Count, Q
+
+from chat.models import ChatRoom, Message, RoomReadState
+from chat.redis_pool import get_redis
+from chat.versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+# Per-user hash {room_id: last read seq}. It is authoritative while it holds
+# LOADED_FIELD, i.e. once it has been primed from RoomReadState; marks only
+# ever move forward. "user_id:room_id" pairs changed since the last
+# write-back wait in DIRTY_KEY.
+LOADED_FIELD = "_loaded"
+DIRTY_KEY = "read_marks:dirty"
+
+# Raise the mark to ARGV[2] if it is higher; queue ARGV[3] for write-back.
+_ADVANCE = """
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+if tonumber(ARGV[2]) <= current then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if ARGV[3] ~= '' then
+    redis.call('SADD', KEYS[2], ARGV[3])
+end
+return 1
+"""
+_advance_script = None
+
+
+def marks_key(user_id):
+    return f"read_marks:{user_id}"
+
+
+def _advance(client, user_id, room_id, seq, dirty=True):
+    global _advance_script
+    if _advance_script is None:
+        _advance_script = client.register_script(_ADVANCE)
+    member = f"{user_id}:{room_id}" if dirty else ""
+    return _advance_script(
+        keys=[marks_key(user_id), DIRTY_KEY], args=[room_id, seq, member], client=client
+    )
+
+
+def _store(marks):
+    """Upsert (user_id, room_id, seq) rows; a stored mark never moves back."""
+    room_ids = {room_id for _, room_id, _ in marks}
+    # Rooms deleted since the mark was taken have nothing left to update.
+    existing = set(
+        ChatRoom.objects.filter(id__in=room_ids).values_list("id", flat=True)
+    )
+    rows = [mark for mark in marks if mark[1] in existing]
+    if not rows:
+        return 0
+    table = RoomReadState._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"""
+            INSERT INTO {table} (user_id, chat_room_id, last_read_seq, updated_at)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (user_id, chat_room_id) DO UPDATE SET
+                last_read_seq = GREATEST(
+                    {table}.last_read_seq, EXCLUDED.last_read_seq
+                ),
+                updated_at = EXCLUDED.updated_at
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def _stored_marks(user_id):
+    return dict(
+        RoomReadState.objects.filter(user_id=user_id).values_list(
+            "chat_room_id", "last_read_seq"
+        )
+    )
+
+
+def mark_read(user_id, room_id, seq=None):
+    """
+    Move the user's read mark in the room up to `seq` (the room's newest
+    message when None), clamped to the room's last seq. Returns the mark,
+    or None if the room does not exist.
+    """
+    last_seq = (
+        ChatRoom.objects.filter(id=room_id).values_list("last_seq", flat=True).first()
+    )
+    if last_seq is None:
+        return None
+    seq = last_seq if seq is None else max(0, min(int(seq), last_seq))
+    try:
+        advanced = _advance(get_redis(), user_id, room_id, seq)
+    except redis.RedisError as e:
+        logger.error(f"[mark_read] Redis error, writing through: {e}")
+        advanced = _store([(user_id, room_id, seq)])
+    if advanced:
+        # Unread counts are part of the room list.
+        bump_versions(user_ids=[user_id])
+    return seq
+
+
+def read_marks(user_id):
+    """{room_id: last read seq} for every room the user has read in."""
+    client = get_redis()
+    key = marks_key(user_id)
+    try:
+        marks = client.hgetall(key)
+        if LOADED_FIELD not in marks:
+            for room_id, seq in _stored_marks(user_id).items():
+                _advance(client, user_id, room_id, seq, dirty=False)
+            client.hset(key, LOADED_FIELD, 1)
+            marks = client.hgetall(key)
+    except redis.RedisError as e:
+        logger.error(f"[read_marks] Redis error: {e}")
+        return _stored_marks(user_id)
+    return {int(room): int(seq) for room, seq in marks.items() if room != LOADED_FIELD}
+
+
+def unread_counts(user_id, room_ids):
+    """
+    {room_id: messages from others after the user's read mark} for
+    `room_ids`, in one grouped COUNT whose per-room seq ranges are served
+    by the (chat_room, seq) index. Rooms with nothing unread are omitted.
+    """
+    if not room_ids:
+        return {}
+    marks = read_marks(user_id)
+    after_mark = Q()
+    for room_id in room_ids:
+        after_mark |= Q(chat_room_id=room_id, seq__gt=marks.get(room_id, 0))
+    counts = (
+        Message.objects.filter(after_mark)
+        .exclude(sender_id=user_id)
+        .values("chat_room_id")
+        .annotate(unread=Count("id"))
+        .order_by()
+    )
+    return {row["chat_room_id"]: row["unread"] for row in counts}
+
+
+def flush_read_marks(batch_size=1000):
+    """Write marks changed since the last flush back to RoomReadState."""
+    client = get_redis()
+    total = 0
+    while True:
+        members = client.spop(DIRTY_KEY, batch_size)
+        if not members:
+            return total
+        pairs = [tuple(map(int, member.split(":"))) for member in members]
+        pipe = client.pipeline(transaction=False)
+        for user_id, room_id in pairs:
+            pipe.hget(marks_key(user_id), room_id)
+        marks = [
+            (user_id, room_id, int(seq))
+            for (user_id, room_id), seq in zip(pairs, pipe.execute())
+            if seq is not None
+        ]
+        try:
+            total += _store(marks)
+        except DatabaseError:
+            client.sadd(DIRTY_KEY, *members)
+            raise
+
+
+def run_read_mark_flusher(interval):
+    """Flush forever, every `interval` seconds; runs in a daemon thread."""
+    while True:
+        time.sleep(interval)
+        try:
+            flushed = flush_read_marks()
+            if flushed:
+                logger.info(f"[read_marks] Wrote back {flushed} read marks")
+        except Exception as e:
+            logger.exception(f"[read_marks] Write-back failed: {e}")
+        finally:
+            close_old_connections()
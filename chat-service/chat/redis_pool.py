@@ -0,0 +1,46 @@
+# chat-service/chat/redis_pool.py
+import asyncio
+
+import redis  # type: ignore
+import redis.asyncio as aioredis  # type: ignore
+from django.conf import settings
+
+_pool = None
+# One async pool per event loop; daphne runs a single loop per process.
+_async_pool = None
+_async_pool_loop = None
+
+
+def get_redis():
+    """
+    Return a Redis client backed by a process-wide connection pool.
+    Clients are cheap to build; the pool is what keeps sockets open.
+    """
+    global _pool
+    if _pool is None:
+        _pool = redis.ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+    return redis.StrictRedis(connection_pool=_pool)
+
+
+def get_async_redis():
+    """
+    asyncio counterpart of get_redis() for consumers, bound to the running loop.
+    """
+    global _async_pool, _async_pool_loop
+    loop = asyncio.get_running_loop()
+    if _async_pool is None or _async_pool_loop is not loop:
+        _async_pool = aioredis.ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        _async_pool_loop = loop
+    return aioredis.StrictRedis(connection_pool=_async_pool)
@@ -0,0 +1,79 @@
+# chat-service/chat/room_events.py
+import logging
+
+from django.conf import settings
+
+from chat.redis_pool import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+MESSAGE = "message"
+TRANSLATION = "translation"
+
+
+def room_events_key(room_id):
+    return f"room_events:{room_id}"
+
+
+def _entry(group_name, text, message_id, kind):
+    # `group` is the channel-layer group the frame was sent to, so a replay
+    # only returns frames the reconnecting socket would have received live.
+    return {"frame": text, "group": group_name, "message_id": message_id, "kind": kind}
+
+
+async def append_room_event(room_id, group_name, text, message_id, kind=MESSAGE):
+    """
+    Record an encoded frame in the room's capped stream. Must run before the
+    group_send so a socket resuming concurrently cannot miss it.
+    """
+    key = room_events_key(room_id)
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                key,
+                _entry(group_name, text, message_id, kind),
+                maxlen=settings.ROOM_EVENT_BUFFER_SIZE,
+                approximate=True,
+            )
+            pipe.expire(key, settings.ROOM_EVENT_BUFFER_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"[append_room_event] Failed for room {room_id}: {e}")
+
+
+def append_room_event_sync(room_id, group_name, text, message_id, kind=MESSAGE):
+    key = room_events_key(room_id)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.xadd(
+            key,
+            _entry(group_name, text, message_id, kind),
+            maxlen=settings.ROOM_EVENT_BUFFER_SIZE,
+            approximate=True,
+        )
+        pipe.expire(key, settings.ROOM_EVENT_BUFFER_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"[append_room_event] Failed for room {room_id}: {e}")
+
+
+async def events_since(room_id, last_message_id, groups):
+    """
+    Encoded frames recorded after the message `last_message_id`, oldest
+    first, limited to frames sent to one of `groups`. Returns None when that
+    message is no longer in the buffer and the client must refetch history.
+    """
+    try:
+        entries = await get_async_redis().xrevrange(room_events_key(room_id))
+    except Exception as e:
+        logger.error(f"[events_since] Failed for room {room_id}: {e}")
+        return None
+
+    missed = []
+    for _, fields in entries:
+        if fields["kind"] == MESSAGE and int(fields["message_id"]) == last_message_id:
+            missed.reverse()
+            return missed
+        if fields["group"] in groups:
+            missed.append(fields["frame"])
+    return None
@@ -1,7 +1,8 @@
 # chat_service/chat/routing.py
 from django.urls import path
-from .consumers import ChatConsumer
+from .consumers import ChatConsumer, MultiplexChatConsumer
 
 websocket_urlpatterns = [
+    path("ws/chat/", MultiplexChatConsumer.as_asgi()),
     path("ws/chat/<int:room_id>/", ChatConsumer.as_asgi()),
 ]
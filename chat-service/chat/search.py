@@ -0,0 +1,65 @@
+# chat-service/chat/search.py
+from decimal import Decimal
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core import signing
+from django.db.models import DecimalField, F, Q
+from django.db.models.functions import Cast
+
+from chat.models import ChatRoom, Message
+
+SEARCH_CONFIG = "simple"
+CURSOR_SALT = "chat-app.search-cursor"
+
+
+def search_messages(user, text, room_id=None, substring=False, cursor=None, limit=50):
+    """
+    Messages matching `text` in rooms the user belongs to (optionally one
+    room), as (messages, next_cursor); next_cursor is None on the last page.
+
+    Full-text mode matches the GIN-indexed search_vector with websearch
+    syntax and orders by rank. Substring mode matches content with ILIKE,
+    newest first, and is served by the trigram index of rooms that have one
+    (see the create_trigram_index command). Raises signing.BadSignature for
+    a tampered cursor.
+    """
+    if room_id is not None:
+        if not ChatRoom.objects.filter(id=room_id, members=user).exists():
+            return [], None
+        # A literal room id lets the planner use that room's partial index.
+        messages = Message.objects.filter(chat_room_id=room_id)
+    else:
+        rooms = ChatRoom.objects.filter(members=user).values("id")
+        messages = Message.objects.filter(chat_room__in=rooms)
+    position = signing.loads(cursor, salt=CURSOR_SALT) if cursor else None
+
+    if substring:
+        messages = messages.filter(content__icontains=text).order_by("-id")
+        if position:
+            messages = messages.filter(id__lt=position["i"])
+    else:
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        messages = (
+            messages.filter(search_vector=query)
+            # ts_rank is a float4; a fixed numeric round-trips through the
+            # cursor exactly, so rows tying on rank are not skipped.
+            .annotate(
+                rank=Cast(
+                    SearchRank(F("search_vector"), query),
+                    DecimalField(max_digits=12, decimal_places=6),
+                )
+            ).order_by("-rank", "-id")
+        )
+        if position:
+            messages = messages.filter(
+                Q(rank__lt=Decimal(position["r"]))
+                | Q(rank=Decimal(position["r"]), id__lt=position["i"])
+            )
+
+    rows = list(messages.defer("search_vector")[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    position = {"i": last.id} if substring else {"r": str(last.rank), "i": last.id}
+    return rows, signing.dumps(position, salt=CURSOR_SALT)
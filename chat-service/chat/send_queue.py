@@ -0,0 +1,110 @@
+# chat-service/chat/send_queue.py
+import asyncio
+import logging
+import weakref
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+EVICT = "evict"
+
+# Live queues of this process, for metrics only.
+_queues = weakref.WeakSet()
+_dropped = 0
+_evictions = 0
+
+
+class OutboundQueue:
+    """
+    Bounded per-connection queue between channel-layer handlers and the socket.
+
+    put() never waits, so a slow client no longer stalls its consumer; one
+    writer task drains frames to `send` in order. When the queue is full the
+    oldest frame is dropped (DROP_OLDEST) until the client has been over the
+    limit for `grace` seconds, after which put() returns False and the caller
+    evicts the connection. With EVICT, the first overflow evicts. The
+    over-limit clock resets once the client drains to half the depth.
+    """
+
+    def __init__(self, send, maxsize, policy=DROP_OLDEST, grace=5.0):
+        self._send = send
+        self.maxsize = maxsize
+        self.policy = policy
+        self.grace = grace
+        self._frames = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = None
+        self._over_since = None
+        self.closed = False
+        _queues.add(self)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def put(self, text):
+        global _dropped
+        if self.closed:
+            return True
+        if len(self._frames) >= self.maxsize:
+            now = asyncio.get_running_loop().time()
+            if self._over_since is None:
+                self._over_since = now
+            if self.policy == EVICT or now - self._over_since >= self.grace:
+                return False
+            self._frames.popleft()
+            _dropped += 1
+        self._frames.append(text)
+        self._idle.clear()
+        self._ready.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return True
+
+    async def _run(self):
+        while True:
+            while self._frames:
+                text = self._frames.popleft()
+                if len(self._frames) <= self.maxsize // 2:
+                    self._over_since = None
+                try:
+                    await self._send(text)
+                except Exception as e:
+                    logger.warning(f"[OutboundQueue] Send failed, stopping: {e}")
+                    self.discard()
+                    return
+            self._idle.set()
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def flush(self, timeout):
+        """Wait up to `timeout` seconds for queued frames to reach the socket."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def discard(self):
+        self.closed = True
+        self._frames.clear()
+        self._idle.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
+def record_eviction():
+    global _evictions
+    _evictions += 1
+
+
+def send_queue_metrics():
+    depths = [len(queue) for queue in list(_queues) if not queue.closed]
+    return {
+        "connections": len(depths),
+        "depth_total": sum(depths),
+        "depth_max": max(depths, default=0),
+        "dropped": _dropped,
+        "evictions": _evictions,
+    }
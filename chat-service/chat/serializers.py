@@ -1,7 +1,7 @@
 # chat/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import ChatRoom, Message
+from .models import ChatRoom, Message, RoomEvent
 from .dispatch import (
     publish_chat_room_created,
     publish_new_message,
@@ -9,7 +9,11 @@ from .dispatch import (
     send_translation_request,
 )
 from .translation_handler import get_language_preference  # only this stays
-from chat.translation_handler import get_translated_result_from_cache
+from .user_replica import resolve_usernames
+from chat.translation_handler import (
+    get_translated_result_from_cache,
+    get_translated_results_from_cache,
+)
 
 
 import logging
@@ -43,15 +47,18 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         rep["admin"] = instance.admin.username
         return rep
 
+    def validate_members_usernames(self, value):
+        members, missing = resolve_usernames(value)
+        if missing:
+            raise serializers.ValidationError(f"Unknown users: {', '.join(missing)}")
+        self._resolved_members = members
+        return value
+
     def create(self, validated_data):
-        members_usernames = validated_data.pop("members_usernames", [])
+        validated_data.pop("members_usernames", None)
         user = self.context["request"].user
         chat_room = ChatRoom.objects.create(**validated_data, admin=user)
-        chat_room.members.add(user)
-        for username in members_usernames:
-            member, _ = User.objects.get_or_create(username=username)
-            chat_room.members.add(member)
-        chat_room.save()
+        chat_room.members.add(user, *getattr(self, "_resolved_members", []))
         publish_chat_room_created(
             room_id=chat_room.id, room_name=chat_room.name, admin_id=chat_room.admin.id
         )
@@ -64,18 +71,76 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ChatRoomSummarySerializer(serializers.ModelSerializer):
+    """
+    Room list entry; expects ChatRoomViewSet.summary_queryset annotations
+    and an unread_count attribute.
+    """
+
+    admin = serializers.CharField(source="admin.username", read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+    last_message_preview = serializers.CharField(read_only=True, allow_null=True)
+    last_message_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    unread_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta:
+        model = ChatRoom
+        fields = [
+            "id",
+            "name",
+            "admin",
+            "member_count",
+            "last_message_preview",
+            "last_message_at",
+            "unread_count",
+        ]
+
+
+class RoomEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RoomEvent
+        fields = ["id", "room_id", "user_id", "kind", "name", "created_at"]
+
+
+class MessageListSerializer(serializers.ListSerializer):
+    """
+    Fetches the requesting user's translations for the whole page with one
+    MGET before rendering, instead of one Redis GET per message.
+    """
+
+    def to_representation(self, data):
+        messages = list(data.all() if hasattr(data, "all") else data)
+        request = self.context.get("request")
+        if request and request.user.is_authenticated:
+            self.child.translations = get_translated_results_from_cache(
+                [message.id for message in messages], request.user.id
+            )
+        try:
+            return super().to_representation(messages)
+        finally:
+            self.child.translations = None
+
+
 class MessageSerializer(serializers.ModelSerializer):
+    # Prefetched {message_id: text} set by MessageListSerializer
+    translations = None
+
     class Meta:
         model = Message
-        fields = "__all__"
-        read_only_fields = ["user"]
+        exclude = ["search_vector"]
+        read_only_fields = ["user", "seq"]
+        list_serializer_class = MessageListSerializer
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
         request = self.context.get("request")
         if request and request.user.is_authenticated:
-            user_id = request.user.id
-            translated_text = get_translated_result_from_cache(instance.id, user_id)
+            if self.translations is not None:
+                translated_text = self.translations.get(instance.id)
+            else:
+                translated_text = get_translated_result_from_cache(
+                    instance.id, request.user.id
+                )
             if translated_text:
                 data["content"] = translated_text  # Override original content
         return data
@@ -0,0 +1,92 @@
+# chat-service/chat/signed_tokens.py
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+
+from .redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Must match users-management-service/users/signed_tokens.py
+SIGNING_SALT = "chat-app.auth-token"
+DENYLIST_KEY = "auth:denylist"
+
+_denylist = frozenset()
+_denylist_refreshed_at = 0.0
+_denylist_lock = threading.Lock()
+
+
+def is_signed_token(token):
+    # Opaque DRF keys are 40 hex characters; signed tokens carry ":" separators.
+    return ":" in token
+
+
+def sign_claims(claims):
+    """
+    Counterpart of users-management-service's issue_signed_token, used by
+    tests and benchmarks to mint tokens with the shared key.
+    """
+    return signing.dumps(
+        claims, key=settings.AUTH_TOKEN_SIGNING_KEY, salt=SIGNING_SALT, compress=True
+    )
+
+
+def verify_signed_token(token):
+    """
+    Verify a signed token in-process and return the user info dict carried
+    in its claims. Raises signing.BadSignature when the token is forged,
+    expired or on the logout denylist.
+    """
+    if not settings.AUTH_TOKEN_SIGNING_KEY:
+        raise signing.BadSignature("Signed tokens are not configured.")
+    claims = signing.loads(
+        token, key=settings.AUTH_TOKEN_SIGNING_KEY, salt=SIGNING_SALT
+    )
+    if claims["exp"] < time.time():
+        raise signing.SignatureExpired("Token expired.")
+    if is_denylisted(claims["jti"]):
+        raise signing.BadSignature("Token revoked.")
+    return {"id": claims["uid"], "username": claims["usr"], "email": claims["eml"]}
+
+
+def deny_token(jti, exp):
+    """
+    Add a logged-out token to the shared denylist until it expires.
+    Expired entries are pruned on every write so the set stays small.
+    """
+    redis_client = get_redis()
+    redis_client.zadd(DENYLIST_KEY, {jti: exp})
+    redis_client.zremrangebyscore(DENYLIST_KEY, "-inf", time.time())
+
+
+def denylist_is_stale():
+    return time.monotonic() - _denylist_refreshed_at >= settings.AUTH_DENYLIST_REFRESH
+
+
+def refresh_denylist(force=False):
+    """
+    Reload the process-local copy of the denylist from Redis when it is
+    older than AUTH_DENYLIST_REFRESH seconds.
+    """
+    global _denylist, _denylist_refreshed_at
+    if not force and not denylist_is_stale():
+        return
+    with _denylist_lock:
+        if not force and not denylist_is_stale():
+            return
+        now = time.monotonic()
+        try:
+            members = get_redis().zrangebyscore(DENYLIST_KEY, time.time(), "+inf")
+            _denylist = frozenset(members)
+        except Exception as e:
+            # Keep the previous copy; retry on the next refresh interval.
+            logger.error(f"[refresh_denylist] Redis error: {e}")
+        _denylist_refreshed_at = now
+
+
+def is_denylisted(jti):
+    refresh_denylist()
+    return jti in _denylist
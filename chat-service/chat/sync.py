@@ -0,0 +1,72 @@
+# chat-service/chat/sync.py
+from django.core import signing
+from django.db.models import Max, Q
+
+from chat.models import ChatRoom, Message, RoomEvent
+
+CURSOR_SALT = "chat-app.sync-cursor"
+
+
+def encode_cursor(room_seqs, event_id):
+    seqs = {str(room_id): seq for room_id, seq in room_seqs.items()}
+    return signing.dumps({"r": seqs, "e": event_id}, salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor):
+    """Returns ({room_id: seq}, event_id); raises signing.BadSignature."""
+    data = signing.loads(cursor, salt=CURSOR_SALT)
+    seqs = {int(room_id): int(seq) for room_id, seq in data["r"].items()}
+    return seqs, int(data["e"])
+
+
+def _room_heads(user):
+    # last_seq is bumped in the transaction that inserts the messages, so
+    # every seq up to a committed last_seq is already visible.
+    return dict(ChatRoom.objects.filter(members=user).values_list("id", "last_seq"))
+
+
+def current_cursor(user):
+    """A cursor at the head of the user's rooms and the event log."""
+    return encode_cursor(
+        _room_heads(user),
+        RoomEvent.objects.aggregate(last=Max("id"))["last"] or 0,
+    )
+
+
+def collect_changes(user, cursor, limit):
+    """
+    Messages and room events after `cursor` across the user's rooms, each
+    capped at `limit` rows. Returns (messages, events, next_cursor, has_more).
+
+    Messages are tracked per room by seq, which commits in order within a
+    room, so a message committed late in one room is never skipped because
+    another room's later message was seen first. Event ids commit in order
+    (see RoomEvent.log). Rooms joined since the cursor start at their head:
+    the member_added event tells the client to load their history.
+    """
+    seqs, event_id = decode_cursor(cursor)
+    marks = {
+        room_id: seqs.get(room_id, head) for room_id, head in _room_heads(user).items()
+    }
+
+    messages = []
+    if marks:
+        after = Q()
+        for room_id, seq in marks.items():
+            after |= Q(chat_room_id=room_id, seq__gt=seq)
+        messages = list(
+            Message.objects.filter(after).order_by("chat_room_id", "seq")[: limit + 1]
+        )
+    # Rooms the user left or lost are matched through user_id.
+    events = list(
+        RoomEvent.objects.filter(
+            Q(room_id__in=list(marks)) | Q(user_id=user.id), id__gt=event_id
+        ).order_by("id")[: limit + 1]
+    )
+    has_more = len(messages) > limit or len(events) > limit
+    messages, events = messages[:limit], events[:limit]
+
+    for message in messages:
+        marks[message.chat_room_id] = message.seq
+    next_cursor = encode_cursor(marks, events[-1].id if events else event_id)
+    return messages, events, next_cursor, has_more
@@ -4,8 +4,8 @@ import requests
 from django.conf import settings
 import pika  # type: ignore
 import logging
-import redis  # type: ignore
 from django.core.cache import cache
+from chat.redis_pool import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -27,22 +27,40 @@ def set_language_preference(user_id, room_id, language_code):
     send_language_change_notification(user_id, room_id, language_code)
 
 
-def get_translated_result_from_cache(
-    message_id, user_id, host="redis", port=6379, db=1
-):
+def get_translated_result_from_cache(message_id, user_id):
     """
     Fetch a cached translated message from Redis.
     Key format: translation:<user_id>:<message_id>
     """
     try:
-        r = redis.StrictRedis(host=host, port=port, db=db, decode_responses=True)
-        key = f"translation:{user_id}:{message_id}"
-        return r.get(key)
+        return get_redis().get(f"translation:{user_id}:{message_id}")
     except Exception as e:
         logger.error(f"[get_translated_result_from_cache] Redis error: {e}")
         return None
 
 
+def get_translated_results_from_cache(message_ids, user_id):
+    """
+    Fetch the user's cached translations for many messages with one MGET.
+    Returns {message_id: translated_text} for the messages that have one.
+    """
+    message_ids = list(message_ids)
+    if not message_ids:
+        return {}
+    try:
+        values = get_redis().mget(
+            [f"translation:{user_id}:{message_id}" for message_id in message_ids]
+        )
+    except Exception as e:
+        logger.error(f"[get_translated_results_from_cache] Redis error: {e}")
+        return {}
+    return {
+        message_id: value
+        for message_id, value in zip(message_ids, values)
+        if value is not None
+    }
+
+
 def get_rabbit_connection():
     credentials = pika.PlainCredentials(
         settings.RABBITMQ_USER, settings.RABBITMQ_PASSWORD
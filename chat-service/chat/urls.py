@@ -2,7 +2,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from .views import ChatRoomViewSet, MessageViewSet
+from .views import (
+    ChatRoomViewSet,
+    MessageViewSet,
+    export_room,
+    process_metrics,
+    search,
+    sync_changes,
+)
 
 router = DefaultRouter()
 router.register(r"rooms", ChatRoomViewSet, basename="chatroom")
@@ -21,4 +28,8 @@ urlpatterns = [
         ChatRoomViewSet.as_view({"post": "set_language"}),
         name="set-language",
     ),
+    path("metrics/", process_metrics, name="process-metrics"),
+    path("sync/", sync_changes, name="sync"),
+    path("search/", search, name="search"),
+    path("export/", export_room, name="export-room"),
 ]
@@ -0,0 +1,98 @@
+# chat-service/chat/user_replica.py
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from chat.versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+REPLICATED_FIELDS = ["username", "email", "is_active"]
+
+
+def apply_user_batch(users):
+    """
+    Idempotently upsert users from the users-management-service event stream.
+    `users` is a list of {"user_id", "username", "email", "is_active"} dicts;
+    the whole batch costs two SELECTs plus at most one bulk INSERT and one
+    bulk UPDATE. Returns (created, updated) counts.
+    """
+    User = get_user_model()
+    incoming = {}
+    for data in users:
+        # Later entries for the same id win, matching stream order.
+        incoming[data["user_id"]] = data
+
+    with transaction.atomic():
+        existing = User.objects.select_for_update().in_bulk(list(incoming))
+        taken = dict(
+            User.objects.filter(username__in=[d["username"] for d in incoming.values()])
+            .exclude(id__in=list(incoming))
+            .values_list("username", "id")
+        )
+
+        to_create, to_update = [], []
+        for user_id, data in incoming.items():
+            if data["username"] in taken:
+                logger.error(
+                    f"[apply_user_batch] Username {data['username']} for user {user_id} "
+                    f"is held by local user {taken[data['username']]}; skipping"
+                )
+                continue
+            user = existing.get(user_id)
+            if user is None:
+                to_create.append(
+                    User(
+                        id=user_id,
+                        username=data["username"],
+                        email=data["email"],
+                        is_active=data.get("is_active", True),
+                    )
+                )
+                continue
+            changed = False
+            for field in REPLICATED_FIELDS:
+                value = data.get(field, getattr(user, field))
+                if getattr(user, field) != value:
+                    setattr(user, field, value)
+                    changed = True
+            if changed:
+                to_update.append(user)
+
+        if to_create:
+            User.objects.bulk_create(to_create, ignore_conflicts=True)
+        if to_update:
+            User.objects.bulk_update(to_update, REPLICATED_FIELDS)
+
+    if to_update:
+        # Room list responses embed usernames.
+        bump_versions(users=True)
+    return len(to_create), len(to_update)
+
+
+def deactivate_users(user_ids):
+    """
+    Users deleted upstream are deactivated rather than deleted so their
+    messages and rooms (which cascade on delete) survive.
+    """
+    deactivated = (
+        get_user_model()
+        .objects.filter(id__in=user_ids, is_active=True)
+        .update(is_active=False)
+    )
+    if deactivated:
+        bump_versions(users=True)
+    return deactivated
+
+
+def resolve_usernames(usernames):
+    """
+    Map usernames to local replica users with one query.
+    Returns (users, missing_usernames).
+    """
+    users = list(
+        get_user_model().objects.filter(username__in=set(usernames), is_active=True)
+    )
+    found = {user.username for user in users}
+    return users, sorted(set(usernames) - found)
@@ -5,6 +5,9 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 import logging
 from django.contrib.auth import get_user_model
+from django.core import signing
+from .auth_cache import get_cached_user_info, cache_user_info
+from .signed_tokens import is_signed_token, verify_signed_token
 
 logger = logging.getLogger(__name__)
 
@@ -13,34 +16,74 @@ def get_user_model_instance():
     return get_user_model()
 
 
-def validate_token(token):
-    url = f"{settings.USERS_SERVICE_URL}/api/validate-token/"
+def introspect_token(token):
+    """
+    Validate the token and fetch its user with a single call to
+    users-management-service. Returns the user info dict or None.
+    """
+    url = f"{settings.USERS_SERVICE_URL}/api/introspect-token/"
     headers = {"Authorization": f"Token {token}"}
-    logger.debug(f"Sending token validation request to {url} with headers {headers}")
-    response = requests.get(url, headers=headers)
-    logger.debug(f"Token validation response: {response.status_code} - {response.text}")
-    if response.status_code != 200:
-        return False
-    try:
-        return response.json().get("valid", False)
-    except ValueError as e:
-        logger.error(f"Error parsing token validation response: {e}")
-        return False
-
-
-def get_user_info(token):
-    url = f"{settings.USERS_SERVICE_URL}/api/user-info/"
-    headers = {"Authorization": f"Token {token}"}
-    logger.debug(f"Sending user info request to {url} with headers {headers}")
-    response = requests.get(url, headers=headers)
-    logger.debug(f"User info response: {response.status_code} - {response.text}")
+    logger.debug(f"Sending token introspection request to {url}")
+    response = requests.get(
+        url, headers=headers, timeout=settings.USERS_SERVICE_TIMEOUT
+    )
+    logger.debug(f"Token introspection response: {response.status_code}")
     if response.status_code != 200:
         return None
     try:
-        return response.json()
+        data = response.json()
     except ValueError as e:
-        logger.error(f"Error parsing user info response: {e}")
+        logger.error(f"Error parsing token introspection response: {e}")
+        return None
+    if not data.get("valid", False):
         return None
+    return {"id": data["id"], "username": data["username"], "email": data["email"]}
+
+
+def sync_local_user(user_info):
+    """
+    Return the local replica of a users-management-service user, creating it
+    on first sight. Only writes when username or email actually changed, so
+    read-only traffic never issues an UPDATE.
+    """
+    User = get_user_model_instance()
+    user, created = User.objects.get_or_create(
+        id=user_info["id"],
+        defaults={"username": user_info["username"], "email": user_info["email"]},
+    )
+    if not created and (
+        user.username != user_info["username"] or user.email != user_info["email"]
+    ):
+        user.username = user_info["username"]
+        user.email = user_info["email"]
+        user.save(update_fields=["username", "email"])
+        # Imported here: chat_manager.settings imports this module.
+        from .versions import bump_versions
+
+        bump_versions(users=True)
+    return user
+
+
+def resolve_user_info(token):
+    """
+    Map a token to user info. Signed tokens are verified in-process; opaque
+    DRF tokens go through the introspection cache and, on a miss, one call
+    to users-management-service. Raises AuthenticationFailed.
+    """
+    if is_signed_token(token):
+        try:
+            return verify_signed_token(token)
+        except signing.BadSignature:
+            raise AuthenticationFailed("Invalid or expired token.")
+
+    user_info = get_cached_user_info(token)
+    if user_info is None:
+        user_info = introspect_token(token)
+        if not user_info:
+            logger.debug("Token validation failed")
+            raise AuthenticationFailed("Invalid token.")
+        cache_user_info(token, user_info)
+    return user_info
 
 
 class CustomTokenAuthentication(BaseAuthentication):
@@ -52,24 +95,9 @@ class CustomTokenAuthentication(BaseAuthentication):
         token = auth_header.split(" ")[1]
         logger.debug(f"Authenticating token: {token}")
 
-        if not validate_token(token):
-            logger.debug("Token validation failed")
-            raise AuthenticationFailed("Invalid token.")
+        user_info = resolve_user_info(token)
 
-        user_info = get_user_info(token)
-        if not user_info:
-            logger.debug("User info not found")
-            raise AuthenticationFailed("User info not found.")
-
-        User = get_user_model_instance()
-        user, created = User.objects.get_or_create(
-            id=user_info["id"],
-            defaults={"username": user_info["username"], "email": user_info["email"]},
-        )
-        if not created:
-            user.username = user_info["username"]
-            user.email = user_info["email"]
-            user.save()
+        user = sync_local_user(user_info)
 
         logger.debug(f"Authenticated user: {user_info}")
         return (user, token)
@@ -0,0 +1,100 @@
+# chat-service/chat/versions.py
+import hashlib
+import logging
+import time
+
+import redis  # type: ignore
+from django.conf import settings
+
+from chat.redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis counters behind the ETags of the room list and message history.
+# A room's counter moves whenever its messages, name or members change; a
+# user's rooms counter whenever a room they belong to (or belonged to) does;
+# the users counter whenever replicated usernames change.
+USERS_VERSION_KEY = "version:users"
+
+
+def room_version_key(room_id):
+    return f"version:room:{room_id}"
+
+
+def user_rooms_version_key(user_id):
+    return f"version:user_rooms:{user_id}"
+
+
+def queue_bump_room(pipe, room_id):
+    pipe.incr(room_version_key(room_id))
+
+
+def bump_versions(room_ids=(), user_ids=(), users=False):
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for room_id in room_ids:
+            queue_bump_room(pipe, room_id)
+        for user_id in user_ids:
+            pipe.incr(user_rooms_version_key(user_id))
+        if users:
+            pipe.incr(USERS_VERSION_KEY)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"[bump_versions] Redis error: {e}")
+
+
+def _read_versions(keys):
+    """
+    Current values of `keys`, or None if Redis is unavailable. A missing
+    counter is seeded with the clock so it cannot repeat a value that an
+    earlier incarnation of the key handed out in an ETag.
+    """
+    client = get_redis()
+    try:
+        values = client.mget(keys)
+        for i, value in enumerate(values):
+            if value is None:
+                client.set(keys[i], time.time_ns(), nx=True)
+                values[i] = client.get(keys[i])
+        return values
+    except redis.RedisError as e:
+        logger.error(f"[versions] Redis error: {e}")
+        return None
+
+
+def make_etag(*parts):
+    # Keyed with SECRET_KEY so clients cannot forge validators for rooms
+    # they have never fetched.
+    raw = ":".join([settings.SECRET_KEY, *map(str, parts)])
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def room_list_etag(request, *args, **kwargs):
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    from chat.models import ChatRoom
+
+    # The list shows each room's newest message, so every room's counter
+    # is part of the validator.
+    room_ids = sorted(
+        ChatRoom.objects.filter(members=user).values_list("id", flat=True)
+    )
+    versions = _read_versions(
+        [user_rooms_version_key(user.id), USERS_VERSION_KEY]
+        + [room_version_key(room_id) for room_id in room_ids]
+    )
+    if versions is None:
+        return None
+    return make_etag("rooms", user.id, *room_ids, *versions)
+
+
+def message_list_etag(request, *args, **kwargs):
+    user = request.user
+    room_id = request.GET.get("chat_room")
+    if not user.is_authenticated or not room_id:
+        return None
+    versions = _read_versions([room_version_key(room_id)])
+    if versions is None:
+        return None
+    return make_etag("messages", user.id, request.GET.urlencode(), *versions)
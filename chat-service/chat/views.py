@@ -4,12 +4,32 @@ from rest_framework import viewsets, permissions, status
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
 from rest_framework.response import Response
-from rest_framework.decorators import action
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+)
+from django.conf import settings
+from django.core import signing
 from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Left
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 from .models import ChatRoom, Message
-from .serializers import ChatRoomSerializer, MessageSerializer
-from .translation_handler import set_language_preference, get_language_preference
+from .serializers import (
+    ChatRoomSerializer,
+    ChatRoomSummarySerializer,
+    MessageSerializer,
+    RoomEventSerializer,
+)
+from .translation_handler import (
+    get_language_preference,
+    get_translated_results_from_cache,
+    set_language_preference,
+)
 from .dispatch import (
     publish_chat_room_deleted,
     publish_chat_room_renamed,
@@ -19,6 +39,24 @@ from .dispatch import (
     send_translation_request,
     publish_user_invited,
 )
+from .ws_events import (
+    notify_language_changed,
+    notify_membership_revoked,
+    notify_room_deleted,
+)
+from .amqp_publisher import publisher_metrics
+from .send_queue import send_queue_metrics
+from .pagination import MessageKeysetPagination
+from .versions import bump_versions, message_list_etag, room_list_etag
+from .sync import collect_changes, current_cursor
+from .search import search_messages
+from .export import aiter_sync, export_chunks, ndjson_stream
+from .read_marks import mark_read, unread_counts
+from .history_cache import (
+    append_message_sync,
+    get_recent_messages,
+    invalidate_room_history,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,8 +72,66 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         """
         Only show rooms where the current user is a member.
         """
+        if self.action == "list":
+            return self.summary_queryset(self.request.user)
         return ChatRoom.objects.filter(members=self.request.user)
 
+    def get_serializer_class(self):
+        # Members are only listed on detail; the list carries summaries.
+        if self.action == "list":
+            return ChatRoomSummarySerializer
+        return super().get_serializer_class()
+
+    @staticmethod
+    def summary_queryset(user):
+        """
+        The user's rooms with admin, member count and newest message in one
+        query: the newest message is read from the (chat_room, seq) index.
+        """
+        memberships = ChatRoom.members.through.objects.filter(user=user)
+        # A plain "-seq" lets Postgres stop after one backward index step;
+        # legacy rows without a seq are not previewed.
+        latest = Message.objects.filter(
+            chat_room=OuterRef("pk"), seq__isnull=False
+        ).order_by("-seq")
+        return (
+            ChatRoom.objects.filter(id__in=memberships.values("chatroom_id"))
+            .select_related("admin")
+            .annotate(
+                member_count=Count("members"),
+                last_message_preview=Subquery(
+                    latest.annotate(
+                        preview=Left("content", settings.ROOM_PREVIEW_LENGTH)
+                    ).values("preview")[:1]
+                ),
+                last_message_at=Subquery(latest.values("timestamp")[:1]),
+            )
+            .order_by("id")
+        )
+
+    @method_decorator(condition(etag_func=room_list_etag))
+    def list(self, request, *args, **kwargs):
+        rooms = list(self.filter_queryset(self.get_queryset()))
+        counts = unread_counts(request.user.id, [room.id for room in rooms])
+        for room in rooms:
+            room.unread_count = counts.get(room.id, 0)
+        return Response(self.get_serializer(rooms, many=True).data)
+
+    @action(detail=True, methods=["post"], url_path="read")
+    def mark_room_read(self, request, pk=None):
+        """
+        Marks the room read up to a message. Expects JSON: {"seq": <int>};
+        without seq, everything currently in the room is marked read.
+        """
+        room = self.get_object()
+        seq = request.data.get("seq")
+        if seq is not None and not isinstance(seq, int):
+            return Response(
+                {"detail": "seq must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"last_read_seq": mark_read(request.user.id, room.id, seq)})
+
     @action(detail=False, methods=["post"], url_path="set-language")
     def set_language(self, request):
         """
@@ -63,6 +159,7 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         from .translation_handler import set_language_preference
 
         set_language_preference(request.user.id, room.id, language)
+        notify_language_changed(room.id, request.user.id, language)
         return Response(
             {"detail": f"Language set to {language}."}, status=status.HTTP_200_OK
         )
@@ -106,6 +203,8 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             member.id for member in room.members.all() if member != room.admin
         ]
         response = super().destroy(request, *args, **kwargs)
+        invalidate_room_history(room_id)
+        notify_room_deleted(room_id)
         publish_chat_room_deleted(room_id)
         for member_id in member_ids:
             send_notification(
@@ -126,7 +225,12 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             return Response(
                 {"detail": "Username is required."}, status=status.HTTP_400_BAD_REQUEST
             )
-        user, _ = User.objects.get_or_create(username=username)
+        user = User.objects.filter(username=username, is_active=True).first()
+        if user is None:
+            return Response(
+                {"detail": f"User '{username}' not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         room.members.add(user)
         room.save()
         publish_user_invited(user.id, room.id, room.name)
@@ -159,6 +263,7 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             )
         room.members.remove(user_to_remove)
         room.save()
+        notify_membership_revoked(room.id, user_to_remove.id)
         publish_member_removed(room.id, user_to_remove.id)
         return Response({"detail": f"User {user_id} removed from the room."})
 
@@ -180,6 +285,7 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             )
         room.members.remove(request.user)
         room.save()
+        notify_membership_revoked(room.id, request.user.id)
         publish_member_left(room.id, request.user.id)
         return Response({"detail": "You have left the room."})
 
@@ -193,19 +299,58 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MessageKeysetPagination
 
     def get_queryset(self):
         room_id = self.request.query_params.get("chat_room")
         if not room_id:
             raise PermissionDenied("Chat room not specified.")
-        # Use distinct() and order_by to avoid duplicates.
-        return (
-            Message.objects.filter(
-                chat_room_id=room_id, chat_room__members=self.request.user
+        # One EXISTS on the membership table instead of joining it per row.
+        if not ChatRoom.objects.filter(id=room_id, members=self.request.user).exists():
+            raise PermissionDenied("You are not a member of this room.")
+        # Messages from before seq existed have none and come first.
+        return Message.objects.filter(chat_room_id=room_id).order_by(
+            F("seq").asc(nulls_first=True), "timestamp"
+        )
+
+    @method_decorator(condition(etag_func=message_list_etag))
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        params = request.query_params
+        if "before" not in params and "after" not in params:
+            # The newest page comes from the room's hot history cache.
+            page_size = self.paginator.get_page_size(request)
+            rows = get_recent_messages(
+                params["chat_room"], page_size, lambda: self.load_recent(queryset)
             )
-            .distinct()
-            .order_by("timestamp")
+            # A short page that does not reach seq 1 may continue into
+            # the room's archive, which only the paginator reads.
+            if rows is not None and (
+                len(rows) == page_size or (rows and rows[0]["seq"] <= 1)
+            ):
+                translations = get_translated_results_from_cache(
+                    [row["id"] for row in rows], request.user.id
+                )
+                rows = [
+                    {**row, "content": translations.get(row["id"], row["content"])}
+                    for row in rows
+                ]
+                return self.paginator.get_cached_page_response(rows, page_size)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def load_recent(queryset):
+        messages = list(
+            queryset.filter(seq__isnull=False).order_by("-seq")[
+                : settings.ROOM_HISTORY_CACHE_SIZE
+            ]
         )
+        messages.reverse()
+        # No request in context: cached rows are untranslated.
+        return [dict(row) for row in MessageSerializer(messages, many=True).data]
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -219,6 +364,8 @@ class MessageViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You are not a member of this room.")
         # Save the message with the sender provided in the context.
         message_instance = serializer.save()
+        row = dict(MessageSerializer(message_instance).data)
+        transaction.on_commit(lambda: append_message_sync(chat_room.id, row))
 
         # Define a function to trigger translation events and notifications.
         def publish_translation_events():
@@ -249,3 +396,132 @@ class MessageViewSet(viewsets.ModelViewSet):
                         )
 
         transaction.on_commit(publish_translation_events)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_room_history(serializer.instance.chat_room_id)
+        bump_versions(room_ids=[serializer.instance.chat_room_id])
+
+    def perform_destroy(self, instance):
+        room_id = instance.chat_room_id
+        super().perform_destroy(instance)
+        invalidate_room_history(room_id)
+        bump_versions(room_ids=[room_id])
+
+
+@api_view(["GET"])
+def sync_changes(request):
+    """
+    What changed in the caller's rooms since `cursor`: new messages and room
+    events (renames, membership changes, deletions), at most SYNC_PAGE_SIZE
+    of each. Call again with the returned cursor while has_more is true.
+    Without a cursor returns an empty page positioned at now.
+    """
+    cursor = request.query_params.get("cursor")
+    if not cursor:
+        return Response(
+            {
+                "messages": [],
+                "events": [],
+                "cursor": current_cursor(request.user),
+                "has_more": False,
+            }
+        )
+    try:
+        messages, events, next_cursor, has_more = collect_changes(
+            request.user, cursor, settings.SYNC_PAGE_SIZE
+        )
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return Response(
+            {"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(
+        {
+            "messages": MessageSerializer(
+                messages, many=True, context={"request": request}
+            ).data,
+            "events": RoomEventSerializer(events, many=True).data,
+            "cursor": next_cursor,
+            "has_more": has_more,
+        }
+    )
+
+
+@api_view(["GET"])
+def search(request):
+    """
+    Ranked full-text search over the caller's rooms.
+    Query params: q (required), chat_room, mode=substring, cursor, page_size.
+    """
+    text = request.query_params.get("q", "").strip()
+    if not text:
+        return Response(
+            {"detail": "q is required."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        room_id = request.query_params.get("chat_room")
+        room_id = int(room_id) if room_id else None
+        page_size = int(
+            request.query_params.get("page_size", settings.MESSAGE_PAGE_SIZE)
+        )
+        messages, cursor = search_messages(
+            request.user,
+            text,
+            room_id=room_id,
+            substring=request.query_params.get("mode") == "substring",
+            cursor=request.query_params.get("cursor"),
+            limit=max(1, min(page_size, settings.MESSAGE_PAGE_SIZE_MAX)),
+        )
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return Response(
+            {"detail": "Invalid search parameters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response(
+        {
+            "results": MessageSerializer(
+                messages, many=True, context={"request": request}
+            ).data,
+            "cursor": cursor,
+        }
+    )
+
+
+@api_view(["GET"])
+def export_room(request):
+    """
+    Streams a room's whole history, oldest first, as NDJSON with the
+    caller's translations applied. Query params: chat_room (required),
+    compress=gzip.
+    """
+    try:
+        room_id = int(request.query_params["chat_room"])
+    except (KeyError, ValueError):
+        return Response(
+            {"detail": "chat_room is required."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if not ChatRoom.objects.filter(id=room_id, members=request.user).exists():
+        raise PermissionDenied("You are not a member of this room.")
+    compress = request.query_params.get("compress") == "gzip"
+    chunks = export_chunks(room_id, user_id=request.user.id)
+    response = StreamingHttpResponse(
+        aiter_sync(ndjson_stream(chunks, compress=compress)),
+        content_type="application/x-ndjson",
+    )
+    filename = f"room-{room_id}.ndjson" + (".gz" if compress else "")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def process_metrics(request):
+    """
+    Counters of this chat-service process, for sizing and alerting.
+    """
+    return Response(
+        {
+            "amqp_publisher": publisher_metrics(),
+            "ws_send_queues": send_queue_metrics(),
+        }
+    )
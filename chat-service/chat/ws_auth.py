@@ -1,9 +1,19 @@
 # chat/ws_auth.py
 
+import asyncio
 from urllib.parse import parse_qs
-from channels.db import database_sync_to_async
-import requests
+import httpx
 import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from .auth_cache import get_local_cache, hash_token
+from .signed_tokens import (
+    denylist_is_stale,
+    is_signed_token,
+    refresh_denylist,
+    verify_signed_token,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,27 +29,91 @@ class SimpleUser:
         return self.id is not None
 
 
-@database_sync_to_async
-def get_user_from_token(token_key):
-    try:
-        headers = {"Authorization": f"Token {token_key}"}
-        valid_resp = requests.get(
-            "http://users-management-service:8001/api/validate-token/", headers=headers
+# One pooled client per event loop; daphne runs a single loop per process.
+_http_client = None
+_http_client_loop = None
+
+# token hash -> Future of the introspection currently in flight (singleflight)
+_inflight = {}
+
+
+def get_http_client():
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.USERS_SERVICE_URL,
+            timeout=settings.USERS_SERVICE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.USERS_SERVICE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.USERS_SERVICE_MAX_CONNECTIONS,
+            ),
         )
-        if valid_resp.status_code == 200 and valid_resp.json().get("valid"):
-            user_resp = requests.get(
-                "http://users-management-service:8001/api/user-info/", headers=headers
-            )
-            if user_resp.status_code == 200:
-                data = user_resp.json()
-                return SimpleUser(
-                    id=data["id"], username=data["username"], email=data["email"]
-                )
-    except Exception as e:
-        logger.warning(f"[TokenAuthMiddlewareStack] Token verification failed: {e}")
+        _http_client_loop = loop
+    return _http_client
+
+
+async def introspect_token_async(token_key):
+    response = await get_http_client().get(
+        "/api/introspect-token/", headers={"Authorization": f"Token {token_key}"}
+    )
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    if not data.get("valid", False):
+        return None
+    return {"id": data["id"], "username": data["username"], "email": data["email"]}
+
+
+async def _introspect_and_cache(token_key, token_hash):
+    user_info = await introspect_token_async(token_key)
+    if user_info:
+        get_local_cache().set(token_hash, user_info)
+    return user_info
+
+
+async def get_user_from_token(token_key):
+    """
+    Resolve a token without leaving the event loop. Concurrent connects with
+    the same token share one in-flight introspection, and valid results are
+    kept in the process-local auth cache, so a reconnect storm costs about
+    one users-management-service call per distinct token.
+    """
+    if not token_key:
+        return SimpleUser()
+    if is_signed_token(token_key):
+        return await get_user_from_signed_token(token_key)
+    token_hash = hash_token(token_key)
+    data = get_local_cache().get(token_hash)
+    if data is None:
+        future = _inflight.get(token_hash)
+        if future is None:
+            future = asyncio.ensure_future(_introspect_and_cache(token_key, token_hash))
+            _inflight[token_hash] = future
+            future.add_done_callback(lambda _: _inflight.pop(token_hash, None))
+        try:
+            data = await asyncio.shield(future)
+        except Exception as e:
+            logger.warning(f"[TokenAuthMiddlewareStack] Token verification failed: {e}")
+            return SimpleUser()
+    if data:
+        return SimpleUser(id=data["id"], username=data["username"], email=data["email"])
     return SimpleUser()
 
 
+async def get_user_from_signed_token(token_key):
+    # The denylist refresh is the only I/O; keep it off the event loop and
+    # out of the shared sync thread.
+    if denylist_is_stale():
+        await sync_to_async(refresh_denylist, thread_sensitive=False)()
+    try:
+        data = verify_signed_token(token_key)
+    except signing.BadSignature as e:
+        logger.warning(f"[TokenAuthMiddlewareStack] Signed token rejected: {e}")
+        return SimpleUser()
+    return SimpleUser(id=data["id"], username=data["username"], email=data["email"])
+
+
 def TokenAuthMiddlewareStack(inner):
     async def middleware(scope, receive, send):
         query_string = scope.get("query_string", b"").decode()
@@ -0,0 +1,61 @@
+# chat-service/chat/ws_events.py
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+# WebSocket close codes sent to clients whose room access was revoked
+CLOSE_MEMBERSHIP_REVOKED = 4403
+CLOSE_ROOM_DELETED = 4404
+# Sent to clients that fell too far behind; they may reconnect right away.
+CLOSE_SLOW_CONSUMER = 4408
+
+
+def room_group_name(room_id):
+    return f"chat_{room_id}"
+
+
+def user_room_group_name(room_id, user_id):
+    return f"chat_{room_id}_user_{user_id}"
+
+
+def language_group_name(room_id, language_code):
+    return f"chat_{room_id}_lang_{language_code}"
+
+
+def _group_send(group, event):
+    try:
+        async_to_sync(get_channel_layer().group_send)(group, event)
+    except Exception as e:
+        logger.error(f"[ws_events] Failed to send {event['type']} to {group}: {e}")
+
+
+def notify_membership_revoked(room_id, user_id):
+    """
+    Tell live consumers of `user_id` in the room to drop their cached context
+    and close. Called from the sync REST views after remove/leave.
+    """
+    _group_send(
+        room_group_name(room_id),
+        {"type": "membership_revoked", "room_id": room_id, "user_id": user_id},
+    )
+
+
+def notify_room_deleted(room_id):
+    _group_send(room_group_name(room_id), {"type": "room_deleted", "room_id": room_id})
+
+
+def notify_language_changed(room_id, user_id, language_code):
+    """
+    Move the user's live sockets in the room to the new language group.
+    """
+    _group_send(
+        user_room_group_name(room_id, user_id),
+        {
+            "type": "language_changed",
+            "room_id": room_id,
+            "language": language_code,
+        },
+    )
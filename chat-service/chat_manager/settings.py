@@ -2,6 +2,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 import chat.utils
 import chat.middleware
 
@@ -120,6 +121,25 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Message history pages (chat.pagination.MessageKeysetPagination)
+MESSAGE_PAGE_SIZE = int(os.getenv("MESSAGE_PAGE_SIZE", 50))
+MESSAGE_PAGE_SIZE_MAX = int(os.getenv("MESSAGE_PAGE_SIZE_MAX", 200))
+# Messages older than the retention horizon are moved to per-room monthly
+# gzip NDJSON files by `manage.py archive_messages`
+MESSAGE_RETENTION_DAYS = int(os.getenv("MESSAGE_RETENTION_DAYS", 365))
+MESSAGE_ARCHIVE_DIR = os.getenv("MESSAGE_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+# Rows fetched per server-side cursor round trip when exporting a room
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+# Characters of the newest message shown in the room list
+ROOM_PREVIEW_LENGTH = int(os.getenv("ROOM_PREVIEW_LENGTH", 100))
+# Seconds between write-backs of read marks from Redis to Postgres
+READ_MARK_FLUSH_INTERVAL = int(os.getenv("READ_MARK_FLUSH_INTERVAL", 10))
+# Max messages and max room events returned by one sync/ call
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", 500))
+# Newest messages per room kept serialized in Redis for room opens
+ROOM_HISTORY_CACHE_SIZE = int(os.getenv("ROOM_HISTORY_CACHE_SIZE", 50))
+ROOM_HISTORY_CACHE_TTL = int(os.getenv("ROOM_HISTORY_CACHE_TTL", 3600))
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -129,14 +149,71 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Write-behind persistence of WebSocket messages: flush every N messages or
+# M milliseconds, whichever comes first; submit() blocks past MAX_PENDING.
+MESSAGE_WRITER_BATCH_SIZE = int(os.getenv("MESSAGE_WRITER_BATCH_SIZE", 100))
+MESSAGE_WRITER_FLUSH_MS = int(os.getenv("MESSAGE_WRITER_FLUSH_MS", 10))
+MESSAGE_WRITER_MAX_PENDING = int(os.getenv("MESSAGE_WRITER_MAX_PENDING", 5000))
+
+# Translation updates go to the requesting user's sockets in the room ("user"),
+# or once per language to everyone reading the room in it ("language").
+TRANSLATION_DELIVERY = os.getenv("TRANSLATION_DELIVERY", "user")
+
+# Rooms a single multiplexed socket (ws/chat/) may subscribe to
+WS_MAX_SUBSCRIPTIONS = int(os.getenv("WS_MAX_SUBSCRIPTIONS", 200))
+
+# Per-socket outbound queue. When full, the oldest frame is dropped
+# ("drop_oldest") or the socket is evicted at once ("evict"); sockets still
+# over the limit after the grace period are closed with code 4408.
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+WS_SEND_QUEUE_POLICY = os.getenv("WS_SEND_QUEUE_POLICY", "drop_oldest")
+WS_SLOW_CONSUMER_GRACE = float(os.getenv("WS_SLOW_CONSUMER_GRACE", 5))
+
 # RabbitMQ Configuration
 RABBITMQ_HOST = "rabbitmq"
 RABBITMQ_PORT = 5672
 RABBITMQ_USER = os.getenv("RABBITMQ_DEFAULT_USER", "default_username")
 RABBITMQ_PASSWORD = os.getenv("RABBITMQ_DEFAULT_PASS", "default_password")
+# Async publisher used by the WebSocket consumers (chat.amqp_publisher)
+AMQP_CHANNEL_POOL_SIZE = int(os.getenv("AMQP_CHANNEL_POOL_SIZE", 4))
+AMQP_PUBLISHER_CONFIRMS = os.getenv("AMQP_PUBLISHER_CONFIRMS", "False") == "True"
+# Translation requests published within this window go out as one batch
+AMQP_PUBLISH_LINGER_MS = int(os.getenv("AMQP_PUBLISH_LINGER_MS", 5))
+# User events already delivered are applied together, up to this many at once
+USER_EVENT_BATCH_SIZE = int(os.getenv("USER_EVENT_BATCH_SIZE", 200))
 
 
 USERS_SERVICE_URL = os.getenv("USERS_SERVICE_URL", "http://localhost:8001")
+USERS_SERVICE_TIMEOUT = 5
+USERS_SERVICE_MAX_CONNECTIONS = 100
+
+# Redis (shared tier for caches that are not the channel layer)
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = 6379
+REDIS_DB = 1
+REDIS_SOCKET_TIMEOUT = 2
+
+# Per-room ring buffer of recent WebSocket events, replayed on reconnect.
+# Reconnects whose gap is older than the buffer must refetch history.
+ROOM_EVENT_BUFFER_SIZE = int(os.getenv("ROOM_EVENT_BUFFER_SIZE", 500))
+ROOM_EVENT_BUFFER_TTL = int(os.getenv("ROOM_EVENT_BUFFER_TTL", 86400))
+
+# Token introspection cache (seconds). The local TTL bounds how long a
+# revoked token keeps working in a process that missed the logout event.
+AUTH_CACHE_LOCAL_TTL = int(os.getenv("AUTH_CACHE_LOCAL_TTL", 30))
+AUTH_CACHE_LOCAL_MAXSIZE = 10000
+AUTH_CACHE_REDIS_TTL = int(os.getenv("AUTH_CACHE_REDIS_TTL", 300))
+
+# Signed tokens issued by users-management-service (AUTH_TOKEN_MODE=signed)
+# are verified locally with this shared key; unset disables them.
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "opaque")
+AUTH_TOKEN_SIGNING_KEY = os.getenv("AUTH_TOKEN_SIGNING_KEY")
+if AUTH_TOKEN_MODE == "signed" and not AUTH_TOKEN_SIGNING_KEY:
+    raise ImproperlyConfigured(
+        "AUTH_TOKEN_MODE=signed requires AUTH_TOKEN_SIGNING_KEY."
+    )
+# How often each process reloads the logout denylist from Redis (seconds)
+AUTH_DENYLIST_REFRESH = int(os.getenv("AUTH_DENYLIST_REFRESH", 5))
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Chat Service API",
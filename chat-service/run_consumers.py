@@ -3,6 +3,7 @@
 import os
 import django
 import logging
+import threading
 import traceback
 
 # Set environment and initialize Django
@@ -13,6 +14,17 @@ django.setup()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from django.conf import settings
+from chat.read_marks import run_read_mark_flusher
+
+# Read marks are written back from Redis to Postgres alongside the consumer.
+threading.Thread(
+    target=run_read_mark_flusher,
+    args=(settings.READ_MARK_FLUSH_INTERVAL,),
+    name="read-mark-flusher",
+    daemon=True,
+).start()
+
 try:
     from chat.consumers import start_rabbitmq_consumer
 
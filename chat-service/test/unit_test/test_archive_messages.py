@@ -0,0 +1,92 @@
+# test/unit_test/test_archive_messages.py
+
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ArchivedRange, ChatRoom, Message
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(settings, tmp_path):
+    settings.MESSAGE_ARCHIVE_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="archivist", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def chat_room(user):
+    room = ChatRoom.objects.create(name="Old Room", admin=user)
+    room.members.add(user)
+    for i in range(5):
+        Message.objects.create(content=f"m{i}", sender=user, chat_room=room)
+    # The first three are two years old.
+    Message.objects.filter(chat_room=room, seq__lte=3).update(
+        timestamp=timezone.now() - timedelta(days=730)
+    )
+    return room
+
+
+def test_old_months_move_to_archive(chat_room, archive_dir):
+    call_command("archive_messages", "--older-than-days", "365")
+
+    remaining = Message.objects.filter(chat_room=chat_room).order_by("seq")
+    assert [m.content for m in remaining] == ["m3", "m4"]
+    archived = ArchivedRange.objects.get(chat_room=chat_room)
+    assert (archived.first_seq, archived.last_seq, archived.message_count) == (1, 3, 3)
+    assert (archive_dir / archived.path).exists()
+
+
+def test_paging_continues_into_archive(auth_client, chat_room):
+    call_command("archive_messages")
+    url = f"/api/chat/messages/?chat_room={chat_room.id}&page_size=2"
+
+    newest = auth_client.get(url).data
+    older = auth_client.get(f"{url}&before={newest['before']}").data
+    oldest = auth_client.get(f"{url}&before={older['before']}").data
+    newer = auth_client.get(f"{url}&after={oldest['after']}").data
+
+    assert [m["content"] for m in newest["results"]] == ["m3", "m4"]
+    assert [m["content"] for m in older["results"]] == ["m1", "m2"]
+    assert older["has_more"] is True
+    assert [m["content"] for m in oldest["results"]] == ["m0"]
+    assert oldest["has_more"] is False
+    assert [m["content"] for m in newer["results"]] == ["m1", "m2"]
+
+
+def test_full_last_table_page_reports_archive(auth_client, chat_room):
+    call_command("archive_messages")
+    url = f"/api/chat/messages/?chat_room={chat_room.id}&page_size=2"
+
+    page = auth_client.get(f"{url}&before=6").data
+
+    assert [m["content"] for m in page["results"]] == ["m3", "m4"]
+    assert page["has_more"] is True
+
+
+def test_deleting_room_removes_archive_files(
+    chat_room, archive_dir, django_capture_on_commit_callbacks
+):
+    call_command("archive_messages")
+    path = archive_dir / ArchivedRange.objects.get(chat_room=chat_room).path
+
+    with django_capture_on_commit_callbacks(execute=True):
+        chat_room.delete()
+
+    assert not path.exists()
@@ -0,0 +1,68 @@
+# test/unit_test/test_auth_cache.py
+
+import pytest
+from unittest.mock import MagicMock, patch
+from rest_framework.test import APIRequestFactory
+from chat import auth_cache
+from chat.auth_cache import TTLCache, hash_token
+from chat.utils import CustomTokenAuthentication
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=-1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.django_db
+@patch("chat.auth_cache.get_redis")
+@patch("chat.utils.requests.get")
+def test_authenticate_hits_users_service_once(mock_get, mock_get_redis):
+    mock_get_redis.return_value.get.return_value = None
+    auth_cache.get_local_cache().clear()
+
+    introspection = MagicMock(status_code=200)
+    introspection.json.return_value = {
+        "valid": True,
+        "id": 7,
+        "username": "cached",
+        "email": "c@x.io",
+    }
+    mock_get.return_value = introspection
+
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="Token abc123")
+    backend = CustomTokenAuthentication()
+
+    user, _ = backend.authenticate(request)
+    user_again, _ = backend.authenticate(request)
+
+    assert user.username == "cached"
+    assert user_again.id == user.id
+    assert mock_get.call_count == 1
+
+
+@patch("chat.auth_cache.get_redis")
+def test_invalidate_token_hash_drops_both_tiers(mock_get_redis):
+    auth_cache.get_local_cache().clear()
+    auth_cache.cache_user_info("tok", {"id": 1})
+
+    auth_cache.invalidate_token_hash(hash_token("tok"))
+
+    assert auth_cache.get_local_cache().get(hash_token("tok")) is None
+    mock_get_redis.return_value.delete.assert_called_once_with(
+        auth_cache.REDIS_KEY_PREFIX + hash_token("tok")
+    )
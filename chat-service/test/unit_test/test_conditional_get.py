@@ -0,0 +1,67 @@
+# test/unit_test/test_conditional_get.py
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="etag_user", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def chat_room(user):
+    room = ChatRoom.objects.create(name="ETag Room", admin=user)
+    room.members.add(user)
+    return room
+
+
+def test_unchanged_room_list_returns_304(auth_client, chat_room):
+    first = auth_client.get("/api/chat/rooms/")
+    etag = first["ETag"]
+
+    second = auth_client.get("/api/chat/rooms/", HTTP_IF_NONE_MATCH=etag)
+    assert second.status_code == 304
+
+    chat_room.name = "Renamed"
+    chat_room.save()
+    third = auth_client.get("/api/chat/rooms/", HTTP_IF_NONE_MATCH=etag)
+    assert third.status_code == 200
+    assert third["ETag"] != etag
+
+
+def test_deleting_a_message_changes_history_etag(auth_client, user, chat_room):
+    message = Message.objects.create(chat_room=chat_room, sender=user, content="hi")
+    url = f"/api/chat/messages/?chat_room={chat_room.id}"
+    etag = auth_client.get(url)["ETag"]
+
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    auth_client.delete(f"/api/chat/messages/{message.id}/?chat_room={chat_room.id}")
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["results"] == []
+
+
+def test_renaming_user_through_auth_changes_room_list_etag(
+    auth_client, user, chat_room
+):
+    from chat.utils import sync_local_user
+
+    etag = auth_client.get("/api/chat/rooms/")["ETag"]
+
+    sync_local_user({"id": user.id, "username": "renamed", "email": user.email})
+    response = auth_client.get("/api/chat/rooms/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data[0]["admin"] == "renamed"
@@ -15,7 +15,8 @@ async def test_receive_creates_message_and_broadcasts():
     user = await sync_to_async(User.objects.create_user)(
         username="ws_test_user", password="pass"
     )
-    room = await sync_to_async(ChatRoom.objects.create)(name="ws_room")
+    room = await sync_to_async(ChatRoom.objects.create)(name="ws_room", admin=user)
+    await sync_to_async(room.members.add)(user)
 
     # Simulate token auth by manually injecting scope
     communicator = WebsocketCommunicator(
@@ -44,3 +45,47 @@ async def test_receive_creates_message_and_broadcasts():
     assert count == 1
 
     await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_connect_rejects_non_members():
+    User = get_user_model()
+    admin = await sync_to_async(User.objects.create_user)(
+        username="ws_admin", password="pass"
+    )
+    outsider = await sync_to_async(User.objects.create_user)(
+        username="ws_outsider", password="pass"
+    )
+    room = await sync_to_async(ChatRoom.objects.create)(name="closed", admin=admin)
+
+    communicator = WebsocketCommunicator(application, f"/ws/chat/{room.id}/")
+    communicator.scope["user"] = outsider
+
+    connected, _ = await communicator.connect()
+    assert not connected
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_membership_revocation_closes_live_socket():
+    from chat.ws_events import CLOSE_MEMBERSHIP_REVOKED, notify_membership_revoked
+
+    User = get_user_model()
+    user = await sync_to_async(User.objects.create_user)(
+        username="ws_revoked", password="pass"
+    )
+    room = await sync_to_async(ChatRoom.objects.create)(name="revoke", admin=user)
+    await sync_to_async(room.members.add)(user)
+
+    communicator = WebsocketCommunicator(application, f"/ws/chat/{room.id}/")
+    communicator.scope["user"] = user
+    connected, _ = await communicator.connect()
+    assert connected
+
+    await sync_to_async(notify_membership_revoked)(room.id, user.id)
+
+    frame = await communicator.receive_json_from()
+    assert frame == {"type": "membership_revoked", "room_id": room.id}
+    closed = await communicator.receive_output()
+    assert closed == {"type": "websocket.close", "code": CLOSE_MEMBERSHIP_REVOKED}
@@ -0,0 +1,97 @@
+# test/unit_test/test_export_room.py
+
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message
+
+# The export reads on its own thread and connection, so data must be committed.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="exporter", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def chat_room(user):
+    room = ChatRoom.objects.create(name="Export Room", admin=user)
+    room.members.add(user)
+    for i in range(5):
+        Message.objects.create(content=f"m{i}", sender=user, chat_room=room)
+    return room
+
+
+def _rows(data):
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def test_export_streams_ndjson(auth_client, chat_room, settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+
+    response = auth_client.get("/api/chat/export/", {"chat_room": chat_room.id})
+
+    assert response.status_code == 200
+    assert response.streaming
+    rows = _rows(b"".join(response))
+    assert [row["content"] for row in rows] == [f"m{i}" for i in range(5)]
+
+
+def test_export_gzip(auth_client, chat_room):
+    response = auth_client.get(
+        "/api/chat/export/", {"chat_room": chat_room.id, "compress": "gzip"}
+    )
+
+    data = gzip.decompress(b"".join(response))
+    assert len(_rows(data)) == 5
+
+
+def test_export_requires_membership(chat_room):
+    stranger = get_user_model().objects.create_user(username="nosy", password="x")
+    client = APIClient()
+    client.force_authenticate(user=stranger)
+
+    response = client.get("/api/chat/export/", {"chat_room": chat_room.id})
+
+    assert response.status_code == 403
+
+
+def test_export_command_writes_file(chat_room, tmp_path):
+    output = tmp_path / "room.ndjson"
+
+    call_command("export_room", str(chat_room.id), "--output", str(output))
+
+    assert [row["seq"] for row in _rows(output.read_bytes())] == [1, 2, 3, 4, 5]
+
+
+def test_export_streams_archived_months_past_the_cache(
+    auth_client, chat_room, settings, tmp_path
+):
+    from chat.archive import _load
+
+    settings.MESSAGE_ARCHIVE_DIR = str(tmp_path)
+    settings.EXPORT_CHUNK_SIZE = 2
+    Message.objects.filter(chat_room=chat_room, seq__lte=3).update(
+        timestamp=timezone.now() - timedelta(days=730)
+    )
+    call_command("archive_messages")
+    _load.cache_clear()
+
+    response = auth_client.get("/api/chat/export/", {"chat_room": chat_room.id})
+
+    assert [row["seq"] for row in _rows(b"".join(response))] == [1, 2, 3, 4, 5]
+    assert _load.cache_info().currsize == 0
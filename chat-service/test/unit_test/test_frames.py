@@ -0,0 +1,14 @@
+# test/unit_test/test_frames.py
+
+import json
+
+from chat.frames import BROADCAST_EVENT, broadcast_event, chat_message_frame
+
+
+def test_broadcast_event_carries_encoded_frame():
+    frame = chat_message_frame("héllo", 1, "alice", 7, 99)
+    event = broadcast_event(frame)
+
+    assert event["type"] == BROADCAST_EVENT
+    assert isinstance(event["text"], str)
+    assert json.loads(event["text"]) == frame
@@ -22,8 +22,10 @@ def auth_client(user):
 
 
 @pytest.fixture
-def chat_room():
-    return ChatRoom.objects.create(name="History Room")
+def chat_room(user):
+    room = ChatRoom.objects.create(name="History Room", admin=user)
+    room.members.add(user)
+    return room
 
 
 @pytest.fixture
@@ -40,6 +42,48 @@ def test_list_messages(auth_client, chat_room, messages):
     response = auth_client.get(url)
 
     assert response.status_code == 200
-    assert isinstance(response.data, list)
-    assert len(response.data) == 2
-    assert response.data[0]["content"] == "First"
+    assert isinstance(response.data["results"], list)
+    assert len(response.data["results"]) == 2
+    assert response.data["results"][0]["content"] == "First"
+
+
+def test_pages_backwards_from_newest(auth_client, user, chat_room):
+    for i in range(5):
+        Message.objects.create(content=f"m{i}", sender=user, chat_room=chat_room)
+    url = f"/api/chat/messages/?chat_room={chat_room.id}&page_size=2"
+
+    newest = auth_client.get(url).data
+    older = auth_client.get(f"{url}&before={newest['before']}").data
+    newer = auth_client.get(f"{url}&after={older['after']}").data
+
+    assert [m["content"] for m in newest["results"]] == ["m3", "m4"]
+    assert newest["has_more"] is True
+    assert [m["content"] for m in older["results"]] == ["m1", "m2"]
+    assert [m["content"] for m in newer["results"]] == ["m3", "m4"]
+    assert newer["has_more"] is False
+
+
+def test_non_members_are_rejected(chat_room):
+    outsider = get_user_model().objects.create_user(username="outsider", password="x")
+    client = APIClient()
+    client.force_authenticate(user=outsider)
+
+    response = client.get(f"/api/chat/messages/?chat_room={chat_room.id}")
+
+    assert response.status_code == 403
+
+
+def test_newest_page_is_served_from_history_cache(
+    auth_client, chat_room, messages, django_assert_num_queries
+):
+    from chat.history_cache import invalidate_room_history
+
+    invalidate_room_history(chat_room.id)
+    url = f"/api/chat/messages/?chat_room={chat_room.id}"
+    first = auth_client.get(url)
+
+    # Only the membership EXISTS check reaches the database.
+    with django_assert_num_queries(1):
+        second = auth_client.get(url)
+
+    assert second.data["results"] == first.data["results"]
@@ -0,0 +1,70 @@
+# test/unit_test/test_message_seq.py
+
+import pytest
+from django.contrib.auth import get_user_model
+from chat.message_writer import MessageWriter
+from chat.models import ChatRoom, Message
+
+
+@pytest.mark.django_db
+def test_seq_is_allocated_per_room():
+    user = get_user_model().objects.create_user(username="seq_user", password="pass")
+    room_a = ChatRoom.objects.create(name="seq_a", admin=user)
+    room_b = ChatRoom.objects.create(name="seq_b", admin=user)
+
+    seqs = [
+        Message.objects.create(chat_room=room, sender=user, content="hi").seq
+        for room in (room_a, room_a, room_b, room_a)
+    ]
+
+    assert seqs == [1, 2, 1, 3]
+    room_a.refresh_from_db()
+    assert room_a.last_seq == 3
+
+
+@pytest.mark.django_db
+def test_bulk_insert_continues_each_room_sequence():
+    user = get_user_model().objects.create_user(username="seq_bulk", password="pass")
+    room_a = ChatRoom.objects.create(name="bulk_a", admin=user)
+    room_b = ChatRoom.objects.create(name="bulk_b", admin=user)
+    Message.objects.create(chat_room=room_a, sender=user, content="first")
+
+    batch = [
+        Message(chat_room_id=room_id, sender_id=user.id, content=str(i))
+        for i, room_id in enumerate([room_a.id, room_b.id, room_a.id])
+    ]
+    MessageWriter._bulk_insert(batch)
+
+    assert [message.seq for message in batch] == [2, 1, 3]
+
+
+@pytest.mark.django_db
+def test_backfill_numbers_legacy_rows_below_existing_seqs():
+    from django.core.management import call_command
+
+    user = get_user_model().objects.create_user(username="seq_legacy", password="x")
+    room = ChatRoom.objects.create(name="legacy", admin=user)
+    numbered = [
+        Message.objects.create(chat_room=room, sender=user, content=f"new {i}")
+        for i in range(2)
+    ]
+    legacy = [
+        Message.objects.create(chat_room=room, sender=user, content=f"old {i}")
+        for i in range(3)
+    ]
+    Message.objects.filter(id__in=[m.id for m in legacy]).update(seq=None)
+
+    call_command("backfill_message_seq")
+
+    ordered = Message.objects.filter(chat_room=room).order_by("seq")
+    assert [(m.content, m.seq) for m in ordered] == [
+        ("old 0", -2),
+        ("old 1", -1),
+        ("old 2", 0),
+        ("new 0", 1),
+        ("new 1", 2),
+    ]
+    for message in numbered:
+        before = message.seq
+        message.refresh_from_db()
+        assert message.seq == before
@@ -0,0 +1,25 @@
+# test/unit_test/test_message_serializer.py
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from chat.models import Message
+from chat.serializers import MessageSerializer
+
+
+def test_list_serialization_fetches_translations_once():
+    messages = [
+        Message(id=i, seq=i, chat_room_id=1, sender_id=1, content=f"m{i}")
+        for i in range(1, 4)
+    ]
+    request = SimpleNamespace(user=SimpleNamespace(id=7, is_authenticated=True))
+
+    with patch(
+        "chat.serializers.get_translated_results_from_cache",
+        return_value={2: "traducido"},
+    ) as batched, patch("chat.serializers.get_translated_result_from_cache") as single:
+        data = MessageSerializer(messages, many=True, context={"request": request}).data
+
+    batched.assert_called_once_with([1, 2, 3], 7)
+    single.assert_not_called()
+    assert [row["content"] for row in data] == ["m1", "traducido", "m3"]
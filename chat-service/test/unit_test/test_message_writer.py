@@ -0,0 +1,91 @@
+# test/unit_test/test_message_writer.py
+
+import asyncio
+import itertools
+import pytest
+from unittest.mock import patch
+from chat.message_writer import MessageWriter
+
+
+def fake_bulk_insert(batches):
+    ids = itertools.count(1)
+
+    def insert(messages):
+        batches.append(len(messages))
+        for message in messages:
+            message.id = next(ids)
+
+    return insert
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_and_returns_ids_in_submission_order():
+    batches = []
+    writer = MessageWriter(batch_size=10, flush_interval=0.05, max_pending=100)
+
+    with patch.object(MessageWriter, "_bulk_insert", fake_bulk_insert(batches)):
+        saved = await asyncio.gather(
+            *[writer.submit(1, 1, f"msg {i}") for i in range(25)]
+        )
+
+    assert [message.content for message in saved] == [f"msg {i}" for i in range(25)]
+    assert [message.id for message in saved] == list(range(1, 26))
+    assert batches == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_writer_propagates_insert_failures():
+    writer = MessageWriter(batch_size=10, flush_interval=0.01, max_pending=10)
+
+    def failing_insert(messages):
+        raise RuntimeError("db down")
+
+    with patch.object(MessageWriter, "_bulk_insert", failing_insert):
+        with pytest.raises(RuntimeError):
+            await writer.submit(1, 1, "lost")
+
+
+@pytest.mark.asyncio
+async def test_bad_room_only_fails_its_own_messages():
+    writer = MessageWriter(batch_size=10, flush_interval=0.05, max_pending=10)
+    ids = itertools.count(1)
+
+    def insert(messages):
+        if any(message.chat_room_id == 2 for message in messages):
+            raise RuntimeError("foreign key violation")
+        for message in messages:
+            message.id = next(ids)
+
+    with patch.object(MessageWriter, "_bulk_insert", insert):
+        results = await asyncio.gather(
+            writer.submit(1, 1, "fine"),
+            writer.submit(2, 1, "doomed"),
+            writer.submit(1, 1, "also fine"),
+            return_exceptions=True,
+        )
+
+    assert [m.content for m in results if not isinstance(m, Exception)] == [
+        "fine",
+        "also fine",
+    ]
+    assert isinstance(results[1], RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_messages_for_deleted_rooms_are_rejected():
+    from chat.models import ChatRoom
+
+    writer = MessageWriter(batch_size=10, flush_interval=0.05, max_pending=10)
+
+    def insert(messages):
+        return [message for message in messages if message.chat_room_id == 2]
+
+    with patch.object(MessageWriter, "_bulk_insert", insert):
+        kept, gone = await asyncio.gather(
+            writer.submit(1, 1, "kept"),
+            writer.submit(2, 1, "gone"),
+            return_exceptions=True,
+        )
+
+    assert kept.content == "kept"
+    assert isinstance(gone, ChatRoom.DoesNotExist)
@@ -0,0 +1,91 @@
+# test/unit_test/test_read_marks.py
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message, RoomReadState
+from chat.read_marks import DIRTY_KEY, flush_read_marks, marks_key
+from chat.redis_pool import get_redis
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="reader", password="x")
+    get_redis().delete(marks_key(user.id), DIRTY_KEY)
+    return user
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def chat_room(user):
+    friend = get_user_model().objects.create_user(username="writer", password="x")
+    room = ChatRoom.objects.create(name="Unread Room", admin=user)
+    room.members.add(user, friend)
+    for i in range(4):
+        Message.objects.create(chat_room=room, sender=friend, content=f"m{i}")
+    Message.objects.create(chat_room=room, sender=user, content="mine")
+    return room
+
+
+def _unread(auth_client):
+    return auth_client.get("/api/chat/rooms/").data[0]["unread_count"]
+
+
+def test_unread_count_follows_read_mark(auth_client, chat_room):
+    assert _unread(auth_client) == 4
+
+    response = auth_client.post(
+        f"/api/chat/rooms/{chat_room.id}/read/", {"seq": 2}, format="json"
+    )
+
+    assert response.data == {"last_read_seq": 2}
+    assert _unread(auth_client) == 2
+
+
+def test_read_mark_never_moves_back(auth_client, chat_room):
+    url = f"/api/chat/rooms/{chat_room.id}/read/"
+    auth_client.post(url, {"seq": 3}, format="json")
+    auth_client.post(url, {"seq": 1}, format="json")
+
+    assert _unread(auth_client) == 1
+
+
+def test_read_without_seq_marks_everything_and_clamps(auth_client, chat_room):
+    url = f"/api/chat/rooms/{chat_room.id}/read/"
+
+    assert auth_client.post(url, {"seq": 999}, format="json").data == {
+        "last_read_seq": 5
+    }
+    assert auth_client.post(url, {}, format="json").data == {"last_read_seq": 5}
+    assert _unread(auth_client) == 0
+
+
+def test_marks_are_written_back_to_postgres(auth_client, user, chat_room):
+    auth_client.post(f"/api/chat/rooms/{chat_room.id}/read/", {"seq": 3}, format="json")
+
+    assert flush_read_marks() == 1
+    state = RoomReadState.objects.get(user=user, chat_room=chat_room)
+    assert state.last_read_seq == 3
+
+    # A cold Redis is primed from Postgres.
+    get_redis().delete(marks_key(user.id))
+    assert _unread(auth_client) == 1
+
+
+def test_unread_counts_take_one_query(
+    auth_client, user, chat_room, django_assert_num_queries
+):
+    from chat.read_marks import read_marks, unread_counts
+
+    read_marks(user.id)
+    with django_assert_num_queries(1):
+        counts = unread_counts(user.id, [chat_room.id])
+    assert counts == {chat_room.id: 4}
@@ -0,0 +1,83 @@
+# test/unit_test/test_room_list.py
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="lister", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def rooms(user):
+    friend = get_user_model().objects.create_user(username="friend", password="x")
+    busy = ChatRoom.objects.create(name="Busy", admin=friend)
+    busy.members.add(user, friend)
+    Message.objects.create(chat_room=busy, sender=friend, content="older")
+    Message.objects.create(chat_room=busy, sender=user, content="x" * 300)
+    quiet = ChatRoom.objects.create(name="Quiet", admin=user)
+    quiet.members.add(user)
+    return busy, quiet
+
+
+def test_room_list_returns_summaries(auth_client, rooms, settings):
+    settings.ROOM_PREVIEW_LENGTH = 10
+
+    response = auth_client.get("/api/chat/rooms/")
+
+    assert response.status_code == 200
+    busy, quiet = response.data
+    assert busy["admin"] == "friend"
+    assert busy["member_count"] == 2
+    assert busy["last_message_preview"] == "x" * 10
+    assert busy["last_message_at"] is not None
+    assert "members" not in busy
+    assert quiet["member_count"] == 1
+    assert quiet["last_message_preview"] is None
+
+
+def test_room_list_query_count_does_not_grow_with_rooms(
+    auth_client, user, rooms, django_assert_max_num_queries
+):
+    for i in range(5):
+        room = ChatRoom.objects.create(name=f"Extra {i}", admin=user)
+        room.members.add(user)
+
+    # The ETag's room id lookup plus the summary query.
+    with django_assert_max_num_queries(2):
+        response = auth_client.get("/api/chat/rooms/")
+    assert len(response.data) == 7
+
+
+def test_room_detail_still_lists_members(auth_client, rooms):
+    busy, _ = rooms
+
+    response = auth_client.get(f"/api/chat/rooms/{busy.id}/")
+
+    assert {m["username"] for m in response.data["members"]} == {"lister", "friend"}
+
+
+def test_new_message_changes_room_list_etag(auth_client, user, rooms):
+    from chat.history_cache import append_message_sync
+
+    busy, _ = rooms
+    etag = auth_client.get("/api/chat/rooms/")["ETag"]
+
+    message = Message.objects.create(chat_room=busy, sender=user, content="new")
+    append_message_sync(busy.id, {"id": message.id, "seq": message.seq})
+
+    response = auth_client.get("/api/chat/rooms/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data[0]["last_message_preview"] == "new"
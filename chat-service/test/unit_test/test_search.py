@@ -0,0 +1,84 @@
+# test/unit_test/test_search.py
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="searcher", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def rooms(user):
+    other = get_user_model().objects.create_user(username="stranger", password="x")
+    mine = ChatRoom.objects.create(name="Mine", admin=user)
+    mine.members.add(user)
+    theirs = ChatRoom.objects.create(name="Theirs", admin=other)
+    theirs.members.add(other)
+    for text in ("deploy tonight", "deploy deploy now", "coffee later"):
+        Message.objects.create(chat_room=mine, sender=user, content=text)
+    Message.objects.create(chat_room=theirs, sender=other, content="deploy secret")
+    return mine, theirs
+
+
+def test_search_is_ranked_and_scoped_to_my_rooms(auth_client, rooms):
+    response = auth_client.get("/api/chat/search/", {"q": "deploy"})
+
+    assert response.status_code == 200
+    contents = [m["content"] for m in response.data["results"]]
+    assert contents == ["deploy deploy now", "deploy tonight"]
+    assert response.data["cursor"] is None
+
+
+def test_search_pages_with_cursor(auth_client, rooms):
+    first = auth_client.get("/api/chat/search/", {"q": "deploy", "page_size": 1})
+    second = auth_client.get(
+        "/api/chat/search/",
+        {"q": "deploy", "page_size": 1, "cursor": first.data["cursor"]},
+    )
+
+    assert [m["content"] for m in first.data["results"]] == ["deploy deploy now"]
+    assert [m["content"] for m in second.data["results"]] == ["deploy tonight"]
+    assert second.data["cursor"] is None
+
+
+def test_substring_mode(auth_client, rooms):
+    mine, _ = rooms
+    response = auth_client.get(
+        "/api/chat/search/", {"q": "ffee", "mode": "substring", "chat_room": mine.id}
+    )
+
+    assert [m["content"] for m in response.data["results"]] == ["coffee later"]
+
+
+def test_rank_ties_span_page_boundaries(auth_client, user, rooms):
+    mine, _ = rooms
+    tied = [
+        Message.objects.create(chat_room=mine, sender=user, content=f"standup {i}")
+        for i in range(5)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "standup", "page_size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = auth_client.get("/api/chat/search/", params).data
+        seen += [m["id"] for m in data["results"]]
+        cursor = data["cursor"]
+        if not cursor:
+            break
+
+    assert seen == [m.id for m in reversed(tied)]
@@ -0,0 +1,60 @@
+# test/unit_test/test_send_queue.py
+
+import asyncio
+
+import pytest
+from chat.send_queue import EVICT, OutboundQueue, send_queue_metrics
+
+
+@pytest.mark.asyncio
+async def test_frames_are_sent_in_order():
+    sent = []
+
+    async def send(text):
+        sent.append(text)
+
+    queue = OutboundQueue(send, maxsize=10)
+    for i in range(5):
+        assert queue.put(str(i))
+    await queue.flush(1)
+
+    assert sent == ["0", "1", "2", "3", "4"]
+    queue.discard()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_then_asks_for_eviction():
+    release = asyncio.Event()
+
+    async def stalled_send(text):
+        await release.wait()
+
+    queue = OutboundQueue(stalled_send, maxsize=2, grace=0.05)
+    queue.put("a")
+    await asyncio.sleep(0)  # writer takes "a" and blocks on the socket
+    queue.put("b")
+    queue.put("c")
+    dropped_before = send_queue_metrics()["dropped"]
+
+    assert queue.put("d")
+    assert send_queue_metrics()["dropped"] == dropped_before + 1
+    assert list(queue._frames) == ["c", "d"]
+
+    await asyncio.sleep(0.06)
+    assert not queue.put("e")
+    queue.discard()
+    release.set()
+
+
+@pytest.mark.asyncio
+async def test_evict_policy_evicts_on_first_overflow():
+    async def stalled_send(text):
+        await asyncio.Event().wait()
+
+    queue = OutboundQueue(stalled_send, maxsize=1, policy=EVICT)
+    queue.put("a")
+    await asyncio.sleep(0)
+    queue.put("b")
+
+    assert not queue.put("c")
+    queue.discard()
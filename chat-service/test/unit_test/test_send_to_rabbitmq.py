@@ -1,22 +1,25 @@
 # test/unit_test/test_send_to_rabbitmq.py
 
+import asyncio
 import pytest
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from chat.consumers import ChatConsumer
+from chat.amqp_publisher import get_publisher
 
 
 @pytest.mark.asyncio
-@patch("chat.consumers.aio_pika.connect_robust")
+@patch("chat.amqp_publisher.aio_pika.connect_robust")
 async def test_send_to_rabbitmq_dispatch(mock_connect):
     # Setup mock objects
     mock_connection = AsyncMock()
     mock_channel = AsyncMock()
-    mock_queue = AsyncMock()
+    mock_channel.is_closed = False
+    mock_channel.default_exchange = MagicMock()
+    mock_channel.default_exchange.publish = AsyncMock()
 
-    mock_connect.return_value.__aenter__.return_value = mock_connection
+    mock_connect.return_value = mock_connection
     mock_connection.channel.return_value = mock_channel
-    mock_channel.declare_queue.return_value = mock_queue
 
     # Instantiate consumer
     consumer = ChatConsumer(scope={"type": "websocket"})
@@ -31,11 +34,30 @@ async def test_send_to_rabbitmq_dispatch(mock_connect):
         "message_id": 42,
     }
 
+    await consumer.send_to_rabbitmq(payload)
     await consumer.send_to_rabbitmq(payload)
 
+    # The connection, channel and queue declaration are reused
     mock_connect.assert_called_once()
+    mock_connection.channel.assert_called_once()
     mock_channel.declare_queue.assert_called_once()
-    mock_channel.default_exchange.publish.assert_called_once()
+    assert mock_channel.default_exchange.publish.call_count == 2
 
     sent_msg = mock_channel.default_exchange.publish.call_args[0][0]
     assert json.loads(sent_msg.body.decode()) == payload
+    assert get_publisher().metrics() == {"in_flight": 0, "published": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_translation_requests_share_one_publish():
+    consumer = ChatConsumer(scope={"type": "websocket"})
+    publisher = get_publisher()
+
+    with patch.object(publisher, "publish_many", AsyncMock()) as publish_many:
+        await asyncio.gather(
+            *[consumer.send_to_rabbitmq({"message_id": i}) for i in range(3)]
+        )
+
+    publish_many.assert_awaited_once()
+    queue_name, payloads = publish_many.call_args[0]
+    assert payloads == [{"message_id": i} for i in range(3)]
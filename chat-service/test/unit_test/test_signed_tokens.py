@@ -0,0 +1,52 @@
+# test/unit_test/test_signed_tokens.py
+
+import time
+import pytest
+from unittest.mock import patch
+from django.core import signing
+from rest_framework.exceptions import AuthenticationFailed
+from chat import signed_tokens
+from chat.signed_tokens import sign_claims, verify_signed_token
+from chat.utils import resolve_user_info
+
+
+@pytest.fixture(autouse=True)
+def signing_key(settings):
+    settings.AUTH_TOKEN_SIGNING_KEY = "test-signing-key"
+    with patch.object(signed_tokens, "_denylist", frozenset()), patch.object(
+        signed_tokens, "_denylist_refreshed_at", time.monotonic()
+    ):
+        yield
+
+
+def make_token(**overrides):
+    claims = {
+        "uid": 5,
+        "usr": "signed_user",
+        "eml": "s@example.com",
+        "jti": "abc",
+        "exp": int(time.time()) + 60,
+    }
+    claims.update(overrides)
+    return sign_claims(claims)
+
+
+@patch("chat.utils.introspect_token")
+def test_signed_token_resolves_without_users_service(mock_introspect):
+    user_info = resolve_user_info(make_token())
+
+    assert user_info == {"id": 5, "username": "signed_user", "email": "s@example.com"}
+    mock_introspect.assert_not_called()
+
+
+def test_expired_or_tampered_tokens_are_rejected():
+    with pytest.raises(signing.BadSignature):
+        verify_signed_token(make_token(exp=int(time.time()) - 1))
+    with pytest.raises(AuthenticationFailed):
+        resolve_user_info(make_token() + "x")
+
+
+def test_denylisted_token_is_rejected():
+    with patch.object(signed_tokens, "_denylist", frozenset({"abc"})):
+        with pytest.raises(signing.BadSignature):
+            verify_signed_token(make_token())
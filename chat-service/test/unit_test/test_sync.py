@@ -0,0 +1,93 @@
+# test/unit_test/test_sync.py
+
+import threading
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from chat.models import ChatRoom, Message, RoomEvent
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="sync_user", password="x")
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_sync_returns_changes_since_cursor(auth_client, user):
+    other = get_user_model().objects.create_user(username="sync_other", password="x")
+    room = ChatRoom.objects.create(name="Sync Room", admin=user)
+    room.members.add(user)
+    gone = ChatRoom.objects.create(name="Doomed", admin=other)
+    gone.members.add(other, user)
+
+    cursor = auth_client.get("/api/chat/sync/").data["cursor"]
+
+    Message.objects.create(chat_room=room, sender=user, content="while away")
+    room.name = "Renamed Room"
+    room.save()
+    room.members.add(other)
+    gone.delete()
+
+    data = auth_client.get("/api/chat/sync/", {"cursor": cursor}).data
+
+    assert [m["content"] for m in data["messages"]] == ["while away"]
+    assert [(e["kind"], e["room_id"]) for e in data["events"]] == [
+        (RoomEvent.RENAMED, room.id),
+        (RoomEvent.MEMBER_ADDED, room.id),
+        (RoomEvent.DELETED, gone.id),
+    ]
+    assert data["has_more"] is False
+
+    again = auth_client.get("/api/chat/sync/", {"cursor": data["cursor"]}).data
+    assert again["messages"] == [] and again["events"] == []
+
+
+def test_sync_rejects_forged_cursor(auth_client):
+    response = auth_client.get("/api/chat/sync/", {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_late_commit_in_another_room_is_not_skipped(auth_client, user):
+    from django.db import connection, transaction
+
+    slow_room = ChatRoom.objects.create(name="Slow", admin=user)
+    fast_room = ChatRoom.objects.create(name="Fast", admin=user)
+    slow_room.members.add(user)
+    fast_room.members.add(user)
+    cursor = auth_client.get("/api/chat/sync/").data["cursor"]
+
+    inserted, release = threading.Event(), threading.Event()
+
+    def slow_writer():
+        # Takes the lower id first but commits after the faster writer.
+        try:
+            with transaction.atomic():
+                Message.objects.create(chat_room=slow_room, sender=user, content="late")
+                inserted.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    writer = threading.Thread(target=slow_writer)
+    writer.start()
+    inserted.wait(5)
+    Message.objects.create(chat_room=fast_room, sender=user, content="early")
+
+    first = auth_client.get("/api/chat/sync/", {"cursor": cursor}).data
+    release.set()
+    writer.join()
+    second = auth_client.get("/api/chat/sync/", {"cursor": first["cursor"]}).data
+
+    assert [m["content"] for m in first["messages"]] == ["early"]
+    assert [m["content"] for m in second["messages"]] == ["late"]
@@ -0,0 +1,56 @@
+# test/unit_test/test_translation_delivery.py
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from channels.testing import WebsocketCommunicator
+from chat_manager.asgi import application
+from chat.consumers import translation_completed_callback
+from chat.models import ChatRoom
+from django.contrib.auth import get_user_model
+from asgiref.sync import sync_to_async
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_translation_update_reaches_only_the_requesting_user():
+    User = get_user_model()
+    alice = await sync_to_async(User.objects.create_user)(
+        username="tr_alice", password="pass"
+    )
+    bob = await sync_to_async(User.objects.create_user)(
+        username="tr_bob", password="pass"
+    )
+    room = await sync_to_async(ChatRoom.objects.create)(name="tr_room", admin=alice)
+    await sync_to_async(room.members.add)(alice, bob)
+
+    sockets = {}
+    for user in (alice, bob):
+        communicator = WebsocketCommunicator(application, f"/ws/chat/{room.id}/")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        assert connected
+        sockets[user.id] = communicator
+
+    body = json.dumps(
+        {
+            "type": "translation_update",
+            "room_id": room.id,
+            "user_id": bob.id,
+            "message_id": 42,
+            "lang": "de",
+            "translated_text": "Hallo",
+        }
+    )
+    await sync_to_async(translation_completed_callback)(
+        MagicMock(), MagicMock(), None, body
+    )
+
+    frame = await sockets[bob.id].receive_json_from()
+    assert frame["type"] == "translation_update"
+    assert frame["message"] == "Hallo"
+    assert await sockets[alice.id].receive_nothing()
+
+    for communicator in sockets.values():
+        await communicator.disconnect()
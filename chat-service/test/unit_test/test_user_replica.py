@@ -0,0 +1,91 @@
+# test/unit_test/test_user_replica.py
+
+import pytest
+from django.contrib.auth import get_user_model
+from chat.user_replica import apply_user_batch, deactivate_users, resolve_usernames
+
+pytestmark = pytest.mark.django_db
+
+
+def event(user_id, username, email="x@example.com", is_active=True):
+    return {
+        "user_id": user_id,
+        "username": username,
+        "email": email,
+        "is_active": is_active,
+    }
+
+
+def test_apply_user_batch_is_idempotent():
+    batch = [event(1, "alice"), event(2, "bob")]
+
+    assert apply_user_batch(batch) == (2, 0)
+    assert apply_user_batch(batch) == (0, 0)
+    assert apply_user_batch([event(2, "bobby")]) == (0, 1)
+
+    assert get_user_model().objects.get(id=2).username == "bobby"
+
+
+def test_deleted_users_are_deactivated_and_not_resolvable():
+    apply_user_batch([event(3, "carol"), event(4, "dave")])
+
+    deactivate_users([3])
+    users, missing = resolve_usernames(["carol", "dave", "erin"])
+
+    assert [user.username for user in users] == ["dave"]
+    assert missing == ["carol", "erin"]
+
+
+def test_sync_local_user_only_writes_on_change(django_assert_num_queries):
+    from chat.utils import sync_local_user
+
+    info = {"id": 11, "username": "replica", "email": "r@x.io"}
+    sync_local_user(info)
+
+    with django_assert_num_queries(1):
+        sync_local_user(info)
+
+    user = sync_local_user({**info, "email": "new@x.io"})
+    user.refresh_from_db()
+    assert user.email == "new@x.io"
+
+
+class FakeChannel:
+    def __init__(self, waiting):
+        self.waiting = list(waiting)
+        self.acks = []
+
+    def get_waiting_message_count(self):
+        return self.waiting.pop(0)
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+
+def test_user_events_waiting_together_are_applied_in_one_batch(monkeypatch):
+    import json
+    from types import SimpleNamespace
+    from chat import consumers, user_replica
+
+    calls = []
+    apply = user_replica.apply_user_batch
+    monkeypatch.setattr(
+        user_replica,
+        "apply_user_batch",
+        lambda users: calls.append(len(users)) or apply(users),
+    )
+    channel = FakeChannel(waiting=[2, 1, 0])
+    bodies = [
+        {"event": "user_created", **event(5, "fay")},
+        {"event": "user_created", **event(6, "gus")},
+        {"event": "user_updated", **event(5, "faye")},
+    ]
+
+    for tag, body in enumerate(bodies, start=1):
+        consumers.user_event_callback(
+            channel, SimpleNamespace(delivery_tag=tag), None, json.dumps(body)
+        )
+
+    assert calls == [3]
+    assert channel.acks == [(3, True)]
+    assert get_user_model().objects.get(id=5).username == "faye"
@@ -0,0 +1,43 @@
+# test/unit_test/test_ws_auth.py
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from chat import ws_auth
+from chat.auth_cache import get_local_cache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_connects_share_one_introspection():
+    get_local_cache().clear()
+    calls = 0
+
+    async def fake_introspect(token_key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"id": 3, "username": "storm", "email": "s@x.io"}
+
+    with patch("chat.ws_auth.introspect_token_async", side_effect=fake_introspect):
+        users = await asyncio.gather(
+            *[ws_auth.get_user_from_token("same-token") for _ in range(50)]
+        )
+        # Served from the local cache once the first call has resolved
+        cached = await ws_auth.get_user_from_token("same-token")
+
+    assert calls == 1
+    assert all(user.username == "storm" for user in users)
+    assert cached.is_authenticated
+    assert ws_auth._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_missing_or_rejected_token_is_anonymous():
+    get_local_cache().clear()
+
+    async def rejected(token_key):
+        return None
+
+    with patch("chat.ws_auth.introspect_token_async", side_effect=rejected):
+        assert not (await ws_auth.get_user_from_token(None)).is_authenticated
+        assert not (await ws_auth.get_user_from_token("bad")).is_authenticated
@@ -0,0 +1,52 @@
+# test/unit_test/test_ws_multiplex.py
+
+import pytest
+from channels.testing import WebsocketCommunicator
+from chat_manager.asgi import application
+from chat.models import ChatRoom
+from django.contrib.auth import get_user_model
+from asgiref.sync import sync_to_async
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_one_socket_serves_many_rooms():
+    User = get_user_model()
+    user = await sync_to_async(User.objects.create_user)(
+        username="mux_user", password="pass"
+    )
+    other = await sync_to_async(User.objects.create_user)(
+        username="mux_other", password="pass"
+    )
+    rooms = []
+    for name in ("mux_a", "mux_b"):
+        room = await sync_to_async(ChatRoom.objects.create)(name=name, admin=user)
+        await sync_to_async(room.members.add)(user)
+        rooms.append(room)
+    foreign = await sync_to_async(ChatRoom.objects.create)(name="mux_x", admin=other)
+
+    communicator = WebsocketCommunicator(application, "/ws/chat/")
+    communicator.scope["user"] = user
+    connected, _ = await communicator.connect()
+    assert connected
+
+    for room in rooms:
+        await communicator.send_json_to({"action": "subscribe", "room_id": room.id})
+        assert await communicator.receive_json_from() == {
+            "type": "subscribed",
+            "room_id": room.id,
+        }
+
+    await communicator.send_json_to({"action": "subscribe", "room_id": foreign.id})
+    error = await communicator.receive_json_from()
+    assert error["type"] == "error" and error["room_id"] == foreign.id
+
+    await communicator.send_json_to(
+        {"action": "message", "room_id": rooms[1].id, "message": "to room b"}
+    )
+    frame = await communicator.receive_json_from()
+    assert frame["type"] == "chat_message"
+    assert frame["room_id"] == rooms[1].id
+    assert frame["message"] == "to room b"
+
+    await communicator.disconnect()
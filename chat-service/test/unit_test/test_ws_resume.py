@@ -0,0 +1,58 @@
+# test/unit_test/test_ws_resume.py
+
+import pytest
+from channels.testing import WebsocketCommunicator
+from chat_manager.asgi import application
+from chat.models import ChatRoom
+from django.contrib.auth import get_user_model
+from asgiref.sync import sync_to_async
+
+
+async def open_socket(user, room, query=""):
+    communicator = WebsocketCommunicator(application, f"/ws/chat/{room.id}/{query}")
+    communicator.scope["user"] = user
+    connected, _ = await communicator.connect()
+    assert connected
+    return communicator
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_reconnect_replays_only_missed_messages():
+    User = get_user_model()
+    user = await sync_to_async(User.objects.create_user)(
+        username="resume_user", password="pass"
+    )
+    room = await sync_to_async(ChatRoom.objects.create)(name="resume", admin=user)
+    await sync_to_async(room.members.add)(user)
+
+    communicator = await open_socket(user, room)
+    ids = []
+    for text in ("first", "second", "third"):
+        await communicator.send_json_to({"message": text})
+        ids.append((await communicator.receive_json_from())["message_id"])
+    await communicator.disconnect()
+
+    communicator = await open_socket(user, room, f"?last_message_id={ids[0]}")
+    replayed = [await communicator.receive_json_from() for _ in range(2)]
+    assert [frame["message"] for frame in replayed] == ["second", "third"]
+    assert await communicator.receive_nothing()
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_gap_beyond_buffer_asks_for_resync():
+    User = get_user_model()
+    user = await sync_to_async(User.objects.create_user)(
+        username="resync_user", password="pass"
+    )
+    room = await sync_to_async(ChatRoom.objects.create)(name="resync", admin=user)
+    await sync_to_async(room.members.add)(user)
+
+    communicator = await open_socket(user, room, "?last_message_id=999999")
+    assert await communicator.receive_json_from() == {
+        "type": "resync_required",
+        "room_id": room.id,
+    }
+    await communicator.disconnect()
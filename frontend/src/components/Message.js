@@ -28,7 +28,8 @@ const Messages = ({ token, currentUsername }) => {
       );
 
       // Handle fallback to original if translation is missing
-      const formatted = response.data.map((msg) => ({
+      // History is paginated; the first page holds the newest messages.
+      const formatted = response.data.results.map((msg) => ({
         id: msg.id,
         original_content: msg.content,
         translated_content: msg.translated_content || null,
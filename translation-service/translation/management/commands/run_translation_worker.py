@@ -73,6 +73,7 @@ class Command(BaseCommand):
                         "room_id": room_id,
                         "user_id": payload["user_id"],
                         "message_id": message_id,
+                        "lang": target_lang,
                         "translated_text": translated_text,
                     }
                     # Publish to the completed queue.
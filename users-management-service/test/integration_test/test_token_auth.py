@@ -18,3 +18,101 @@ def test_token_auth_flow(created_user):
     client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
     protected_resp = client.get("/api/user-info/")
     assert protected_resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_introspect_token_single_and_batch(created_user):
+    client = APIClient()
+    login_resp = client.post(
+        "/api/api-token-auth/",
+        {"username": created_user.username, "password": "testpass123"},
+    )
+    token = login_resp.data["token"]
+
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    single = client.get("/api/introspect-token/")
+    assert single.status_code == 200
+    assert single.data["valid"] is True
+    assert single.data["id"] == created_user.id
+    assert single.data["username"] == created_user.username
+
+    client.credentials()
+    batch = client.post(
+        "/api/introspect-token/", {"tokens": [token, "bogus"]}, format="json"
+    )
+    assert batch.status_code == 200
+    assert batch.data["results"][token]["email"] == created_user.email
+    assert batch.data["results"]["bogus"] == {"valid": False}
+
+
+@pytest.mark.django_db
+def test_signed_token_mode(created_user, settings):
+    settings.AUTH_TOKEN_MODE = "signed"
+    settings.AUTH_TOKEN_SIGNING_KEY = "test-signing-key"
+    client = APIClient()
+
+    login_resp = client.post(
+        "/api/api-token-auth/",
+        {"username": created_user.username, "password": "testpass123"},
+    )
+    assert login_resp.status_code == 200
+    assert login_resp.data["token_type"] == "signed"
+    token = login_resp.data["token"]
+
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    assert client.get("/api/user-info/").data["id"] == created_user.id
+
+    client.post("/api/logout/")
+    assert client.get("/api/introspect-token/").data == {"valid": False}
+
+
+@pytest.mark.django_db
+def test_batch_introspection_rejects_non_string_tokens():
+    client = APIClient()
+
+    response = client.post(
+        "/api/introspect-token/", {"tokens": ["ok", {"key": "x"}]}, format="json"
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_batch_introspection_accepts_signed_tokens(created_user, settings):
+    from users.signed_tokens import issue_signed_token
+
+    settings.AUTH_TOKEN_SIGNING_KEY = "test-signing-key"
+    token = issue_signed_token(created_user)
+
+    response = APIClient().post(
+        "/api/introspect-token/", {"tokens": [token]}, format="json"
+    )
+
+    assert response.data["results"][token]["valid"] is True
+    assert response.data["results"][token]["id"] == created_user.id
+
+
+@pytest.mark.django_db
+def test_opaque_mode_rejects_secret_key_signed_tokens(created_user, settings):
+    import time
+    from django.core import signing
+    from users.signed_tokens import SIGNING_SALT
+
+    settings.AUTH_TOKEN_MODE = "opaque"
+    settings.AUTH_TOKEN_SIGNING_KEY = None
+    forged = signing.dumps(
+        {
+            "uid": created_user.id,
+            "usr": created_user.username,
+            "eml": created_user.email,
+            "jti": "forged",
+            "exp": int(time.time()) + 3600,
+        },
+        salt=SIGNING_SALT,
+        compress=True,
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {forged}")
+
+    assert client.get("/api/user-info/").status_code == 401
+    assert client.get("/api/introspect-token/").data == {"valid": False}
@@ -0,0 +1,38 @@
+import pytest  # type: ignore
+from unittest.mock import patch
+
+
+@pytest.fixture
+def published():
+    events = []
+    with patch(
+        "users.signals.send_notification",
+        side_effect=lambda queue, message: events.append(message),
+    ):
+        yield events
+
+
+@pytest.mark.django_db
+def test_profile_change_publishes_user_updated(created_user, published):
+    created_user.email = "new@example.com"
+    created_user.save()
+
+    assert [m["event"] for m in published] == ["user_updated"]
+    assert published[0]["email"] == "new@example.com"
+
+
+@pytest.mark.django_db
+def test_activation_changes_publish_their_own_events(created_user, published):
+    created_user.is_active = False
+    created_user.save()
+    created_user.is_active = True
+    created_user.save()
+
+    assert [m["event"] for m in published] == ["user_deactivated", "user_activated"]
+
+
+@pytest.mark.django_db
+def test_unchanged_save_publishes_nothing(created_user, published):
+    created_user.save()
+
+    assert published == []
@@ -0,0 +1,38 @@
+# users/authentication.py
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from .signed_tokens import is_signed_token, verify_signed_token
+
+User = get_user_model()
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Accepts "Authorization: Token <signed token>". Opaque DRF tokens are left
+    to rest_framework.authentication.TokenAuthentication.
+    request.auth is set to the verified claims.
+    """
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith(f"{self.keyword} "):
+            return None
+        token = auth_header.split(" ", 1)[1]
+        if not is_signed_token(token):
+            return None
+        try:
+            claims = verify_signed_token(token)
+        except signing.BadSignature:
+            raise AuthenticationFailed("Invalid or expired token.")
+        user = User.objects.filter(id=claims["uid"], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return (user, claims)
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,50 @@
+# users/management/commands/publish_user_snapshot.py
+
+import json
+import pika  # type: ignore[import]
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from users.rabbitmq import get_rabbit_connection, USER_EVENTS_QUEUE
+from users.signals import serialize_user
+
+
+class Command(BaseCommand):
+    help = "Publish every user to user_events_queue in batches so chat-service can bootstrap its user replica."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        User = get_user_model()
+        connection = get_rabbit_connection()
+        try:
+            channel = connection.channel()
+            channel.queue_declare(queue=USER_EVENTS_QUEUE, durable=True)
+
+            batch = []
+            published = 0
+            users = User.objects.order_by("id").only(
+                "id", "username", "email", "is_active"
+            )
+            for user in users.iterator(chunk_size=batch_size):
+                batch.append(serialize_user(user))
+                if len(batch) >= batch_size:
+                    self._publish(channel, batch)
+                    published += len(batch)
+                    batch = []
+            if batch:
+                self._publish(channel, batch)
+                published += len(batch)
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Published {published} users."))
+
+    def _publish(self, channel, batch):
+        channel.basic_publish(
+            exchange="",
+            routing_key=USER_EVENTS_QUEUE,
+            body=json.dumps({"event": "user_snapshot", "users": batch}),
+            properties=pika.BasicProperties(delivery_mode=2),
+        )
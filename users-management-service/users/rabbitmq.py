@@ -4,6 +4,11 @@ import pika  # type: ignore[import]
 import json
 from django.conf import settings
 
+# consumed by chat-service to drop cached token introspections
+USER_LOGGED_OUT_QUEUE = "user_logged_out_queue"
+# consumed by chat-service to maintain its local user replica
+USER_EVENTS_QUEUE = "user_events_queue"
+
 
 def get_rabbit_connection():
     credentials = pika.PlainCredentials(
@@ -1,11 +1,44 @@
 # users_management/users/signals.py
 
-from django.db.models.signals import post_save
+import logging
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .rabbitmq import send_notification
+from .rabbitmq import send_notification, USER_EVENTS_QUEUE
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def serialize_user(user):
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "is_active": user.is_active,
+    }
+
+
+def publish_user_event(event, user):
+    """
+    Publish a user lifecycle event consumed by chat-service to keep its
+    local user replica current. Failures are logged, never raised.
+    """
+    message = {"event": event, **serialize_user(user)}
+    try:
+        send_notification(USER_EVENTS_QUEUE, message)
+    except Exception as e:
+        logger.error(f"Failed to publish {event} for user {user.id}: {e}")
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_identity(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_identity = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", "email", "is_active")
+            .first()
+        )
 
 
 @receiver(post_save, sender=User)
@@ -15,4 +48,25 @@ def notify_new_user_registration(sender, instance, created, **kwargs):
             "type": "new_user",
             "message": f"New user registered: {instance.username}",
         }
-        send_notification("registration_notifications", message)
+        try:
+            send_notification("registration_notifications", message)
+        except Exception as e:
+            logger.error(f"Failed to publish registration notification: {e}")
+        publish_user_event("user_created", instance)
+        return
+    previous = getattr(instance, "_previous_identity", None)
+    if previous is None:
+        publish_user_event("user_updated", instance)
+        return
+    username, email, is_active = previous
+    if is_active != instance.is_active:
+        publish_user_event(
+            "user_activated" if instance.is_active else "user_deactivated", instance
+        )
+    elif (username, email) != (instance.username, instance.email):
+        publish_user_event("user_updated", instance)
+
+
+@receiver(post_delete, sender=User)
+def notify_user_deleted(sender, instance, **kwargs):
+    publish_user_event("user_deleted", instance)
@@ -0,0 +1,86 @@
+# users/signed_tokens.py
+
+import logging
+import time
+import uuid
+
+import redis  # type: ignore
+from django.conf import settings
+from django.core import signing
+
+logger = logging.getLogger(__name__)
+
+# Must match chat-service/chat/signed_tokens.py
+SIGNING_SALT = "chat-app.auth-token"
+DENYLIST_KEY = "auth:denylist"
+
+_redis = None
+
+
+def get_redis():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+    return _redis
+
+
+def is_signed_token(token):
+    # Opaque DRF keys are 40 hex characters; signed tokens carry ":" separators.
+    return ":" in token
+
+
+def issue_signed_token(user):
+    """
+    Issue an HMAC-signed, expiring token that other services can verify
+    in-process with the shared AUTH_TOKEN_SIGNING_KEY.
+    """
+    claims = {
+        "uid": user.id,
+        "usr": user.username,
+        "eml": user.email,
+        "jti": uuid.uuid4().hex,
+        "exp": int(time.time()) + settings.AUTH_TOKEN_TTL,
+    }
+    return signing.dumps(
+        claims, key=settings.AUTH_TOKEN_SIGNING_KEY, salt=SIGNING_SALT, compress=True
+    )
+
+
+def verify_signed_token(token):
+    """
+    Return the token claims, raising signing.BadSignature when the token is
+    forged, expired or revoked.
+    """
+    # Without a key Django would fall back to SECRET_KEY.
+    if not settings.AUTH_TOKEN_SIGNING_KEY:
+        raise signing.BadSignature("Signed tokens are not configured.")
+    claims = signing.loads(
+        token, key=settings.AUTH_TOKEN_SIGNING_KEY, salt=SIGNING_SALT
+    )
+    if claims["exp"] < time.time():
+        raise signing.SignatureExpired("Token expired.")
+    try:
+        revoked = get_redis().zscore(DENYLIST_KEY, claims["jti"]) is not None
+    except redis.RedisError as e:
+        logger.error(f"[verify_signed_token] Redis error: {e}")
+        revoked = False
+    if revoked:
+        raise signing.BadSignature("Token revoked.")
+    return claims
+
+
+def revoke_signed_token(claims):
+    """
+    Add a logged-out token to the denylist shared with chat-service (and
+    every users-service process) until it would have expired anyway.
+    Expired entries are pruned on every write so the set stays small.
+    """
+    client = get_redis()
+    client.zadd(DENYLIST_KEY, {claims["jti"]: claims["exp"]})
+    client.zremrangebyscore(DENYLIST_KEY, "-inf", time.time())
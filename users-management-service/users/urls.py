@@ -1,6 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, CustomAuthToken, Logout, ValidateTokenView, UserInfoView
+from .views import (
+    UserViewSet,
+    CustomAuthToken,
+    Logout,
+    ValidateTokenView,
+    UserInfoView,
+    IntrospectTokenView,
+)
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 # Create a router and register our viewsets with it.
@@ -24,4 +31,5 @@ urlpatterns = [
     path("validate-token/", ValidateTokenView.as_view(), name="validate-token"),
     path("logout/", Logout.as_view(), name="logout"),
     path("user-info/", UserInfoView.as_view(), name="user-info"),
+    path("introspect-token/", IntrospectTokenView.as_view(), name="introspect-token"),
 ]
@@ -6,16 +6,25 @@ from django.core.mail import send_mail
 from django.urls import reverse
 from django.conf import settings
 import uuid
+import hashlib
 import logging
 from .serializers import UserSerializer
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import authentication_classes, permission_classes
 from django.contrib.auth.hashers import make_password
-from .rabbitmq import send_notification
+from .rabbitmq import send_notification, USER_LOGGED_OUT_QUEUE
+from .authentication import SignedTokenAuthentication
+from .signed_tokens import (
+    is_signed_token,
+    issue_signed_token,
+    revoke_signed_token,
+    verify_signed_token,
+)
+from django.core import signing
 
 
 User = get_user_model()
@@ -123,6 +132,15 @@ class CustomAuthToken(ObtainAuthToken):
         )
         if serializer.is_valid():
             user = serializer.validated_data["user"]
+            if settings.AUTH_TOKEN_MODE == "signed":
+                logger.debug(f"Signed token issued for user {user.username}")
+                return Response(
+                    {
+                        "token": issue_signed_token(user),
+                        "token_type": "signed",
+                        "expires_in": settings.AUTH_TOKEN_TTL,
+                    }
+                )
             token, created = Token.objects.get_or_create(user=user)
             logger.debug(f"Token created for user {user.username}")
             return Response({"token": token.key})
@@ -132,7 +150,7 @@ class CustomAuthToken(ObtainAuthToken):
 
 
 class ValidateTokenView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -158,15 +176,42 @@ class Logout(APIView):
         return self.logout(request)
 
     def logout(self, request):
-        if hasattr(request.user, "auth_token"):
+        if isinstance(request.auth, dict) and "jti" in request.auth:
+            # Signed token: nothing to delete, so deny it until it expires.
+            revoke_signed_token(request.auth)
+            try:
+                send_notification(
+                    USER_LOGGED_OUT_QUEUE,
+                    {
+                        "event": "user_logged_out",
+                        "user_id": request.user.id,
+                        "jti": request.auth["jti"],
+                        "exp": request.auth["exp"],
+                    },
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish logout event: {e}")
+        elif hasattr(request.user, "auth_token"):
+            token_key = request.user.auth_token.key
             request.user.auth_token.delete()
+            try:
+                send_notification(
+                    USER_LOGGED_OUT_QUEUE,
+                    {
+                        "event": "user_logged_out",
+                        "user_id": request.user.id,
+                        "token_hash": hashlib.sha256(token_key.encode()).hexdigest(),
+                    },
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish logout event: {e}")
         return Response(
             {"message": "Logged out successfully"}, status=status.HTTP_204_NO_CONTENT
         )
 
 
 class UserInfoView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -178,3 +223,84 @@ class UserInfoView(APIView):
             # Add other fields as needed
         }
         return Response(user_data)
+
+
+class IntrospectTokenView(APIView):
+    """
+    Validates a token and returns the owning user in a single round trip.
+    GET introspects the token in the Authorization header; POST accepts
+    {"tokens": [...]} and resolves the whole batch with one query.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    MAX_BATCH_SIZE = 100
+
+    @staticmethod
+    def _introspect(token):
+        if token is None or not token.user.is_active:
+            return {"valid": False}
+        return {
+            "valid": True,
+            "id": token.user.id,
+            "username": token.user.username,
+            "email": token.user.email,
+        }
+
+    @staticmethod
+    def _introspect_signed(key):
+        try:
+            claims = verify_signed_token(key)
+        except signing.BadSignature:
+            return {"valid": False}
+        return {
+            "valid": True,
+            "id": claims["uid"],
+            "username": claims["usr"],
+            "email": claims["eml"],
+        }
+
+    def get(self, request):
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Token "):
+            return Response({"valid": False})
+        key = auth_header.split(" ", 1)[1]
+        if is_signed_token(key):
+            return Response(self._introspect_signed(key))
+        token = Token.objects.select_related("user").filter(key=key).first()
+        return Response(self._introspect(token))
+
+    def post(self, request):
+        keys = request.data.get("tokens")
+        if not isinstance(keys, list) or not keys:
+            return Response(
+                {"error": "tokens must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(keys) > self.MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"at most {self.MAX_BATCH_SIZE} tokens per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not all(isinstance(key, str) for key in keys):
+            return Response(
+                {"error": "tokens must be strings"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        opaque = [key for key in keys if not is_signed_token(key)]
+        tokens = {
+            token.key: token
+            for token in Token.objects.select_related("user").filter(key__in=opaque)
+        }
+        return Response(
+            {
+                "results": {
+                    key: (
+                        self._introspect_signed(key)
+                        if is_signed_token(key)
+                        else self._introspect(tokens.get(key))
+                    )
+                    for key in keys
+                }
+            }
+        )
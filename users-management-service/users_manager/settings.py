@@ -1,6 +1,7 @@
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 load_dotenv()
 
@@ -158,6 +159,7 @@ SITE_DOMAIN = "localhost:8001"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.TokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
@@ -167,6 +169,24 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Auth tokens: "opaque" issues DRF tokens, "signed" issues HMAC-signed tokens
+# that chat-service verifies in-process with the same signing key.
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "opaque")
+# Must be set explicitly to the value chat-service uses: falling back to
+# SECRET_KEY would issue tokens chat-service silently rejects.
+AUTH_TOKEN_SIGNING_KEY = os.getenv("AUTH_TOKEN_SIGNING_KEY")
+if AUTH_TOKEN_MODE == "signed" and not AUTH_TOKEN_SIGNING_KEY:
+    raise ImproperlyConfigured(
+        "AUTH_TOKEN_MODE=signed requires AUTH_TOKEN_SIGNING_KEY."
+    )
+AUTH_TOKEN_TTL = int(os.getenv("AUTH_TOKEN_TTL", 3600))
+
+# Redis shared with chat-service; holds the logout denylist of signed tokens
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = 6379
+REDIS_DB = 1
+REDIS_SOCKET_TIMEOUT = 2
+
 # RabbitMQ Configuration
 RABBITMQ_HOST = "rabbitmq"
 RABBITMQ_PORT = 5672